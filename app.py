@@ -1,44 +1,79 @@
 import streamlit as st
 import pandas as pd
-import json
-import os
+from draft_engine import PlayerPool, DraftState, DraftSimulator, Recommender, check_roster_limit, get_current_turn, roster_key, total_picks
+from big_board import PAGE_SIZE, BoardModel
+from bulk_picks import NameMatcher, parse_picks, plan_picks
+from forecast import forecast_survival
+from lookahead import LookaheadPlanner
+from speculate import Speculator, state_key
+from standings import Standings
+from draft_store import DraftConflict, DraftStore, claim_legacy_state, clean_draft_id, new_draft_id, saved_drafts
+from perf import PERF_LOG, StageTimer
+from player_cache import read_player_cache, source_fingerprint, write_player_cache
+from player_data import RATING_WEIGHTS, apply_ratings, compact_frame, enrich, project_players, read_breakouts, read_expert_ranks, read_injuries, read_players
 
 st.set_page_config(page_title="Supercoach War Room 2026", layout="wide", initial_sidebar_state="expanded")
 
 # --- 1. PERSISTENCE ENGINE ---
-SAVE_FILE = "draft_state.json"
+def get_store():
+    # One journal per ?draft=<id>, so several drafts can share a server. A session
+    # opened without one resumes the most recently saved draft (so the bare URL finds
+    # the draft again after a crash), or starts a new one, and pins its ID in the URL.
+    draft_id = clean_draft_id(st.query_params.get("draft"))
+    store = st.session_state.get('store')
+    if draft_id is None:
+        draft_id = store.draft_id if store is not None else next(iter(saved_drafts()), None) or new_draft_id()
+        st.query_params["draft"] = draft_id
+    if store is None or store.draft_id != draft_id:
+        store = DraftStore(draft_id)
+        st.session_state.store = store
+    return store
 
 def save_state():
-    state_data = {
-        "step": st.session_state.step,
-        "draft_history": st.session_state.draft_history, 
-        "team_names": st.session_state.team_names,
-        "params": st.session_state.params
+    try:
+        get_store().sync(st.session_state.step, st.session_state.draft_history, st.session_state.team_names, st.session_state.params)
+    except DraftConflict:
+        # Another session wrote this draft first: take its version rather than mixing the two.
+        st.session_state.draft_conflict = True
+        if not load_state_logic():
+            new_state()
+
+def new_state():
+    st.session_state.step = "home"
+    st.session_state.draft_history = []
+    st.session_state.team_names = {}
+    st.session_state.params = {
+        "num_teams": 10, "my_slot": 5, 
+        "DEF": 4, "MID": 5, "RUC": 1, "FWD": 4, "bench_size": 5, "draft_day_mode": False
     }
-    with open(SAVE_FILE, "w") as f:
-        json.dump(state_data, f)
 
 def load_state_logic():
-    if os.path.exists(SAVE_FILE):
-        with open(SAVE_FILE, "r") as f:
-            state = json.load(f)
-            st.session_state.step = state.get("step", "home")
-            st.session_state.draft_history = state.get("draft_history", [])
-            st.session_state.team_names = state.get("team_names", {})
-            st.session_state.params = state.get("params", {
-                "num_teams": 10, "my_slot": 5, 
-                "DEF": 4, "MID": 5, "RUC": 1, "FWD": 4, "bench_size": 5, "draft_day_mode": False
-            })
-            if "bench_size" not in st.session_state.params:
-                st.session_state.params["bench_size"] = 5
-            if "draft_day_mode" not in st.session_state.params:
-                st.session_state.params["draft_day_mode"] = False
-            return True
+    store = get_store()
+    state = store.load()
+    legacy = False
+    if state is None:
+        # A draft_state.json from before the journal is imported into the first draft that finds it
+        state = claim_legacy_state(store.draft_id)
+        legacy = state is not None
+    if state is not None:
+        st.session_state.step = state.get("step", "home")
+        st.session_state.draft_history = state.get("draft_history", [])
+        st.session_state.team_names = state.get("team_names", {})
+        st.session_state.params = state.get("params", {
+            "num_teams": 10, "my_slot": 5, 
+            "DEF": 4, "MID": 5, "RUC": 1, "FWD": 4, "bench_size": 5, "draft_day_mode": False
+        })
+        if "bench_size" not in st.session_state.params:
+            st.session_state.params["bench_size"] = 5
+        if "draft_day_mode" not in st.session_state.params:
+            st.session_state.params["draft_day_mode"] = False
+        if legacy: save_state()
+        return True
     return False
 
 def reset_draft():
-    if os.path.exists(SAVE_FILE):
-        os.remove(SAVE_FILE)
+    if st.session_state.get('speculator') is not None: st.session_state.speculator.shutdown()
+    get_store().delete()
     for key in list(st.session_state.keys()):
         del st.session_state[key]
     st.rerun()
@@ -46,129 +81,118 @@ def reset_draft():
 # --- INITIALIZATION ---
 if 'step' not in st.session_state:
     if not load_state_logic():
-        st.session_state.step = "home"
-        st.session_state.draft_history = []
-        st.session_state.team_names = {}
-        st.session_state.params = {
-            "num_teams": 10, "my_slot": 5, 
-            "DEF": 4, "MID": 5, "RUC": 1, "FWD": 4, "bench_size": 5, "draft_day_mode": False
-        }
+        new_state()
+if st.session_state.pop('draft_conflict', False):
+    st.warning("This draft was changed in another session, so your last action was not saved. Showing the latest saved draft.")
+
+# Stage timings for the sidebar Performance panel; one StageTimer per session.
+if 'perf' not in st.session_state:
+    st.session_state.perf = StageTimer()
+perf = st.session_state.perf
+perf.start_run(step=st.session_state.step)
+perf_box = None
 
-@st.cache_data
-def load_data():
+# cache_resource, not cache_data: the frame is shared read-only (and memory-mapped
+# on a disk-cache hit) rather than unpickled afresh on every rerun.
+@st.cache_resource
+def load_player_base():
+    fingerprint = source_fingerprint()
+    cached = read_player_cache(fingerprint)
+    if cached is not None: return cached
     try:
         # 1. Load Main Supercoach Stats Data
-        df = pd.read_csv('supercoach_data.csv')
-        df.columns = [c.strip() for c in df.columns]
-        if 'full_name' not in df.columns:
-            df['full_name'] = (df['first_name'].astype(str) + ' ' + df['last_name'].astype(str)).str.strip()
-        cols_to_fix = ['Avg', 'Last3_Avg', 'gamesPlayed', 'KickInAvg', 'CbaAvg']
-        for col in cols_to_fix:
-            df[col] = pd.to_numeric(df.get(col, 0), errors='coerce').fillna(0)
-            
+        df = read_players()
+
         # 2. Load Expert Ratings
-        expert_scores = {}
         try:
-            exp_df = pd.read_csv('Draft Doctor SC Ratings.csv')
-            data_rows = exp_df.iloc[1:].copy() 
-            data_rows['Rank'] = pd.to_numeric(data_rows['Rank'], errors='coerce')
-            for _, r in data_rows.iterrows():
-                rank = r['Rank']
-                if pd.isna(rank): continue
-                for col in data_rows.columns:
-                    if col == 'Rank': continue
-                    name = str(r[col]).strip()
-                    if name and name.lower() != 'nan':
-                        current_best = expert_scores.get(name, 999)
-                        if rank < current_best:
-                            expert_scores[name] = rank
+            expert_scores = read_expert_ranks()
         except Exception as e:
+            expert_scores = {}
             st.warning(f"Note: Could not load 'Draft Doctor SC Ratings.csv'. {e}")
 
         # 3. Load Injury Data
         try:
-            inj_df = pd.read_csv('260302 AFL Injury List.csv')
-            inj_dict = dict(zip(inj_df['Player'].str.strip(), inj_df['Estimated Return'].str.strip()))
+            inj_dict = read_injuries()
         except Exception:
             inj_dict = {}
 
         # 4. Load Breakout Data
         try:
-            brk_df = pd.read_csv('260302 AFL Breakout Players.csv')
-            brk_list = brk_df['Player'].str.strip().tolist()
+            brk_list = read_breakouts()
         except Exception:
             brk_list = []
 
-        # Map external lists to main dataframe
-        df['Expert_Rank'] = df['full_name'].map(expert_scores).fillna(999)
-        df['Injury_Return'] = df['full_name'].map(inj_dict).fillna('Healthy')
-        df['Is_Breakout'] = df['full_name'].isin(brk_list)
-
-        # --- UPDATED: Strict Injury Classification Parser ---
-        def get_injury_severity(ret):
-            r = str(ret).lower()
-            # 1. Ignore / Less than 2 weeks
-            if any(x in r for x in ['healthy', 'test', '1 week', 'opening round', 'round zero', 'rd 1']):
-                return 'None'
-            
-            # 2. Long Term (> Season Ending / Months)
-            if 'indefinite' in r or 'months' in r or ('season' in r and not any(x in r for x in ['early', 'mid'])):
-                return 'Long'
-                
-            # 3. Short Term (Strictly 2 to 4 weeks)
-            # Checks if string mentions 2, 3, or 4 weeks without mentioning 5, 6, 7+
-            if 'week' in r and any(c in r for c in ['2', '3', '4']) and not any(c in r for c in ['5', '6', '7', '8', '9', '10']):
-                return 'Short'
-            if 'post-round 2' in r:
-                return 'Short'
-                
-            # 4. Mid Term (Everything else: TBC, 4-6 weeks, Mid-Season, Early Season)
-            return 'Mid'
-            
-        df['Injury_Severity'] = df['Injury_Return'].apply(get_injury_severity)
-        
-        # 5. Enhanced Power Rating calculation
-        def calculate_custom_power(row):
-            score = (row['Avg'] * 0.85) + (row['Last3_Avg'] * 0.05)
-            if 'DEF' in row['positions']: score += (row['KickInAvg'] * 0.2)
-            
-            exp_rank = row['Expert_Rank']
-            if exp_rank <= 10: score += 12.0
-            elif exp_rank <= 25: score += 8.0
-            elif exp_rank <= 50: score += 4.0
-            elif exp_rank <= 100: score += 1.5
-                
-            inj = row['Injury_Severity']
-            if inj == 'Long': score -= 1000.0   
-            elif inj == 'Mid': score -= 20.0    
-            elif inj == 'Short': score -= 5.0   
-
-            return round(score, 1)
-
-        df['Power_Rating'] = df.apply(calculate_custom_power, axis=1)
-        df['Risk_Profile'] = df['gamesPlayed'].apply(lambda x: "🟢 Low" if x >= 18 else ("🟡 Mod" if x >= 12 else "🔴 High"))
-        return df
+        # Map external lists, classify injuries and store the compact frame on disk
+        base = compact_frame(project_players(enrich(df, expert_scores, inj_dict, brk_list)))
+        try:
+            write_player_cache(base, fingerprint)
+        except Exception:
+            pass  # the disk cache only speeds up the next cold start
+        return base
     except Exception as e: 
         st.error(f"Error Loading Data: {e}")
         return pd.DataFrame()
 
-df = load_data()
+@st.cache_resource
+def load_data(weights=RATING_WEIGHTS):
+    # 5. Power Rating; cached separately so reweighting skips the CSV parse
+    base = load_player_base()
+    if base.empty: return base
+    return apply_ratings(base, weights)
 
-# --- 2. HELPERS ---
-def get_current_turn(curr_pick, total_teams):
-    if total_teams <= 0: return 1
-    rnd = ((curr_pick - 1) // total_teams) + 1
-    if rnd % 2 != 0: return (curr_pick - 1) % total_teams + 1
-    return total_teams - ((curr_pick - 1) % total_teams)
+with perf.stage("load_data"):
+    df = load_data()
+perf.meta["players"] = len(df)
+
+@st.cache_resource
+def get_player_pool(_df, weights, rating='Power_Rating'):
+    return PlayerPool(_df, rating)
 
+@st.cache_resource
+def get_board_model(_df, weights):
+    return BoardModel(_df)
+
+@st.cache_resource
+def get_name_matcher(_df, weights):
+    return NameMatcher(get_player_pool(_df, weights))
+
+# --- 2. HELPERS ---
 def get_team_name(tid):
     return st.session_state.team_names.get(str(tid), f"Team {tid}")
 
-def check_roster_limit(chosen_pos, team_id, p, history_list):
-    count = sum(1 for d in history_list if d['team'] == team_id and d.get('assigned_pos') == chosen_pos)
-    if chosen_pos == "RUC":
-        return count < p.get('RUC', 1)
-    return count < (p.get(chosen_pos, 0) + (p.get('bench_size', 5) // 2 + 1))
+def get_draft_state(p):
+    # Risk mode only swaps in a second cached pool; nothing is recomputed per rerun.
+    pool = get_player_pool(df, RATING_WEIGHTS, 'Risk_Rating' if st.session_state.get('risk_mode') else 'Power_Rating')
+    ds = st.session_state.get('draft_state')
+    if ds is None or not ds.in_sync(st.session_state.draft_history, pool, p['num_teams']):
+        ds = DraftState(pool, p['num_teams'], st.session_state.draft_history)
+        st.session_state.draft_state = ds
+    return ds
+
+def get_speculator(p, ds):
+    # Background worker owned by the session; replaced when the league or my slot changes.
+    spec = st.session_state.get('speculator')
+    if spec is None or spec.pool is not ds.pool or roster_key(spec.p) != roster_key(p) or spec.p['my_slot'] != p['my_slot']:
+        if spec is not None: spec.shutdown()
+        spec = Speculator(ds.pool, p)
+        st.session_state.speculator = spec
+    return spec
+
+def get_recommender(p, ds):
+    # Lives in the session so reruns without a new pick reuse the last scores.
+    rec = st.session_state.get('recommender')
+    if rec is None or rec.pool is not ds.pool or rec.params != roster_key(p):
+        rec = Recommender(ds.pool, p)
+        st.session_state.recommender = rec
+    return rec
+
+def get_standings(p, ds):
+    # Per-team totals and best lineups; each rerun only re-scores teams whose picks changed.
+    stand = st.session_state.get('standings')
+    if stand is None or stand.pool is not ds.pool or roster_key(stand.p) != roster_key(p):
+        stand = Standings(ds.pool, p)
+        st.session_state.standings = stand
+    return stand.table(ds)
 
 # --- 3. PAGE ROUTING ---
 if st.session_state.step == "home":
@@ -208,25 +232,33 @@ elif st.session_state.step == "settings":
 
 elif st.session_state.step == "draft":
     p = st.session_state.params
-    bench_val = p.get('bench_size', 5)
-    total_slots_per_team = sum([p['DEF'], p['MID'], p['RUC'], p['FWD']]) + bench_val
-    total_expected_picks = p['num_teams'] * total_slots_per_team
+    total_expected_picks = total_picks(p)
+    ds = get_draft_state(p)
     is_complete = len(st.session_state.draft_history) >= total_expected_picks
 
     with st.sidebar:
         st.title("🛡️ Command Center")
         st.info(f"Slot: {p['my_slot']} | Teams: {p['num_teams']}")
+        st.caption(f"Draft ID: {get_store().draft_id} (open another with ?draft=<id>)")
         if p.get("draft_day_mode", False):
             st.warning("🏆 Live Draft Mode Active")
         if not is_complete:
             st.write(f"Pick Progress: {len(st.session_state.draft_history)} / {total_expected_picks}")
+        st.toggle("🛡️ Risk-Adjusted Ranking", key="risk_mode", help="Rank and sim on a 20th-percentile projection instead of the mean")
         if st.button("🚨 RESET DRAFT", use_container_width=True): reset_draft()
+        with st.expander("⏱️ Performance"):
+            perf_box = st.empty()
+            perf.log_path = PERF_LOG if st.checkbox(f"Log timings to {PERF_LOG}", key="perf_log") else None
+    perf.meta.update(picks=len(st.session_state.draft_history), **{k: p[k] for k in ("num_teams", "bench_size", "DEF", "MID", "RUC", "FWD")})
 
     curr_p_num = len(st.session_state.draft_history) + 1
+    # Identifies the exact draft state (who is gone, every team's counts) and the rating it is
+    # ranked on, so cached forecasts and plans go stale on any pick, undo or risk-mode toggle.
+    draft_key = (len(st.session_state.draft_history), *state_key(ds), ds.pool.rating)
     active_id = get_current_turn(curr_p_num, p['num_teams'])
     
-    taken_names = [d['player'] for d in st.session_state.draft_history]
-    avail_df = df[~df['full_name'].isin(taken_names)].copy()
+    with perf.stage("avail_filter"):
+        avail_df = df[ds.available].copy()
 
     if is_complete:
         st.balloons()
@@ -234,10 +266,17 @@ elif st.session_state.step == "draft":
         if p.get("draft_day_mode", False):
             if st.button("↩️ Undo Last Pick (Mistake?)", use_container_width=True):
                 if st.session_state.draft_history:
-                    st.session_state.draft_history.pop()
+                    ds.pop()
                     save_state()
                     st.rerun()
     else:
+        # While opponents pick, plan my next turn in the background for the likeliest branches;
+        # when it arrives, a matching branch's plan is shown without waiting on the search.
+        spec = get_speculator(p, ds)
+        spec.update(ds, total_expected_picks)
+        if active_id == p['my_slot'] and not (st.session_state.get('lookahead') and st.session_state.lookahead[0] == draft_key):
+            precomputed = spec.result(ds)
+            if precomputed is not None: st.session_state.lookahead = (draft_key, precomputed)
         st.subheader(f"⏱️ Now Picking: {get_team_name(active_id)}")
         act_c1, act_c2 = st.columns([1, 2])
         
@@ -245,115 +284,101 @@ elif st.session_state.step == "draft":
             if p.get("draft_day_mode", False):
                 if st.button("↩️ Undo Last Pick", use_container_width=True):
                     if len(st.session_state.draft_history) > 0:
-                        st.session_state.draft_history.pop()
+                        ds.pop()
                         save_state()
                         st.rerun()
                     else:
                         st.warning("No picks to undo.")
             else:
                 if st.button("🤖 Sim to My Turn", use_container_width=True):
-                    while len(st.session_state.draft_history) < total_expected_picks:
-                        cp = len(st.session_state.draft_history) + 1
-                        tn = get_current_turn(cp, p['num_teams'])
-                        if tn == p['my_slot']: break
-                        
-                        tkn = [d['player'] for d in st.session_state.draft_history]
-                        av_sim = df[~df['full_name'].isin(tkn)].copy()
-                        if av_sim.empty: break
-                        
-                        costs = {pos: 0 for pos in ['DEF', 'MID', 'RUC', 'FWD']}
-                        for pos in costs:
-                            pool = av_sim[av_sim['positions'].str.contains(pos, na=False)].sort_values('Power_Rating', ascending=False)
-                            if len(pool) > (p['num_teams'] + 2): 
-                                costs[pos] = pool.iloc[0]['Power_Rating'] - pool.iloc[p['num_teams']+2]['Power_Rating']
-                        
-                        sim_pks = [d for d in st.session_state.draft_history if d['team'] == tn]
-                        sim_counts = {pos: sum(1 for d in sim_pks if d['assigned_pos'] == pos) for pos in ['DEF', 'MID', 'RUC', 'FWD']}
-                        
-                        best_player, best_pos, best_score = None, None, -9999.0
-                        for _, r in av_sim.iterrows():
-                            for po in r['positions'].split('/'):
-                                if check_roster_limit(po, tn, p, st.session_state.draft_history):
-                                    score = r['Power_Rating'] + (costs.get(po, 0) * 0.4)
-                                    if sim_counts.get(po, 0) < p.get(po, 0): 
-                                        score += 5.0 
-                                    else: 
-                                        score -= 25.0 
-                                        if r['Is_Breakout']: score += 40.0 
-                                        
-                                    if score > best_score:
-                                        best_score = score
-                                        best_player = r['full_name']
-                                        best_pos = po
-                        
-                        if best_player:
-                            st.session_state.draft_history.append({"pick": cp, "team": tn, "player": best_player, "assigned_pos": best_pos})
-                        else: break
+                    if not df.empty:
+                        with perf.stage("sim"): DraftSimulator(ds.pool, p, ds).sim_to_slot(p['my_slot'], total_expected_picks)
                     save_state(); st.rerun()
+            if st.button("🎲 Forecast Availability", use_container_width=True, help="Monte Carlo odds each player survives to your next two picks"):
+                if not df.empty:
+                    with st.spinner("Simulating opponent drafts..."), perf.stage("forecast"):
+                        st.session_state.forecast = (draft_key, *forecast_survival(ds, p, total_expected_picks))
+            if st.button("🔭 Plan My Picks", use_container_width=True, help="Beam search over your remaining picks for the best fielded total"):
+                if not df.empty:
+                    with st.spinner("Searching pick sequences..."), perf.stage("lookahead"):
+                        st.session_state.lookahead = (draft_key, LookaheadPlanner(ds.pool, p).plan(ds, total_expected_picks))
 
         with act_c2:
             r_c1, r_c2, r_c3 = st.columns([2, 1, 1])
-            sel = r_c1.selectbox("Select Player:", [""] + sorted(avail_df['full_name'].tolist()), label_visibility="collapsed")
+            sel = r_c1.selectbox("Select Player:", [""] + get_board_model(df, RATING_WEIGHTS).names_available(ds.available), label_visibility="collapsed")
             conf_pos, can_conf = None, False
             if sel:
                 pos_o = df[df['full_name'] == sel].iloc[0]['positions'].split('/')
                 conf_pos = r_c2.radio("Pos:", pos_o, horizontal=True, label_visibility="collapsed")
-                if check_roster_limit(conf_pos, active_id, p, st.session_state.draft_history): can_conf = True
+                if check_roster_limit(conf_pos, active_id, p, ds): can_conf = True
             if r_c3.button("CONFIRM", type="primary", disabled=not can_conf, use_container_width=True):
-                st.session_state.draft_history.append({"pick": curr_p_num, "team": active_id, "player": sel, "assigned_pos": conf_pos})
+                ds.append({"pick": curr_p_num, "team": active_id, "player": sel, "assigned_pos": conf_pos})
                 save_state(); st.rerun()
 
+        if p.get("draft_day_mode", False):
+            with st.expander("📥 Bulk Add Picks (catch up)"):
+                # Widget keys carry a batch counter so the inputs clear once a batch is applied.
+                batch_no = st.session_state.get('bulk_batch', 0)
+                bulk_text = st.text_area("One pick per line, in draft order: player, position (position optional). A CSV export with a Player column also works.", key=f"bulk_text_{batch_no}", height=150)
+                upload = st.file_uploader("...or upload a CSV / text file", type=["csv", "txt"], key=f"bulk_file_{batch_no}")
+                if upload is not None: bulk_text = upload.getvalue().decode("utf-8-sig", errors="replace")
+                if bulk_text.strip():
+                    bulk, report = plan_picks(parse_picks(bulk_text), ds, p, get_name_matcher(df, RATING_WEIGHTS), st.session_state.team_names, total_expected_picks)
+                    st.dataframe(pd.DataFrame(report), use_container_width=True, hide_index=True)
+                    if st.button(f"✅ Apply {len(bulk)} Picks", type="primary", disabled=not bulk, use_container_width=True):
+                        # One history update, one journal write and one rerun for the whole batch.
+                        ds.extend(bulk)
+                        st.session_state.bulk_batch = batch_no + 1
+                        save_state(); st.rerun()
+
         if not avail_df.empty:
-            active_pks = [d for d in st.session_state.draft_history if d['team'] == active_id]
-            counts = {pos: sum(1 for d in active_pks if d['assigned_pos'] == pos) for pos in ['DEF', 'MID', 'RUC', 'FWD']}
-            costs = {pos: 0 for pos in ['DEF', 'MID', 'RUC', 'FWD']}
-            for pos in costs:
-                pool = avail_df[avail_df['positions'].str.contains(pos, na=False)].sort_values('Power_Rating', ascending=False)
-                if len(pool) > (p['num_teams'] + 2): costs[pos] = pool.iloc[0]['Power_Rating'] - pool.iloc[p['num_teams']+2]['Power_Rating']
-            avail_df['Opt_Score'] = avail_df.apply(
-                lambda row: max([
-                    row['Power_Rating'] + (costs.get(x, 0) * 0.4) + 
-                    (5.0 if counts.get(x, 0) < p.get(x, 0) else (-25.0 + (40.0 if row['Is_Breakout'] else 0.0))) 
-                    for x in row['positions'].split('/') 
-                    if check_roster_limit(x, active_id, p, st.session_state.draft_history)
-                ] + [-999]), axis=1
-            )
+            rec = get_recommender(p, ds)
+            with perf.stage("costs"): rec.sync(ds)
+            with perf.stage("opt_score"): opt_scores = rec.opt_scores(ds, active_id)
+            avail_df['Opt_Score'] = opt_scores[ds.available]
             top_3 = avail_df[avail_df['Opt_Score'] > -500].sort_values('Opt_Score', ascending=False).head(3)
             rec_text = " / ".join([f"**{i+1}. {r['full_name']}** ({r['positions']})" for i, r in top_3.iterrows()])
             st.markdown(f"<p style='font-size: 0.85rem; color: #666;'>💡 Recommended: {rec_text}</p>", unsafe_allow_html=True)
+            la = st.session_state.get('lookahead')
+            if la and la[0] == draft_key and la[1]:
+                plan = la[1]
+                steps = " → ".join(f"{n} ({pos})" for n, pos in plan['plan'][:4])
+                st.markdown(f"<p style='font-size: 0.85rem; color: #666;'>🔭 Lookahead: {steps} · projected fielded {plan['projected']} vs {plan['greedy']} greedy</p>", unsafe_allow_html=True)
 
     # --- TABS ---
     tab_titles = ["🎯 Big Board", "📋 My Team", "📈 Log", "📊 Analysis"]
     if is_complete: tab_titles.append("🏆 Final Teams")
     tabs = st.tabs(tab_titles)
     
-    with tabs[0]:
+    with tabs[0], perf.stage("tab_board"):
         if is_complete: st.info("Draft complete.")
         else:
             search = st.text_input("🔍 Filter Board:", "")
-            disp = avail_df.copy()
-            if search: disp = disp[disp['full_name'].str.contains(search, case=False)]
-            if not disp.empty and 'Opt_Score' in disp.columns:
-                disp = disp.sort_values('Opt_Score', ascending=False)
-                disp['Score'] = disp['Opt_Score'].apply(lambda x: "FULL" if x <= -500 else round(x, 1))
-                
-                disp['Expert'] = disp['Expert_Rank'].apply(lambda x: f"Top {int(x)}" if x != 999 else "-")
-                disp['Breakout'] = disp['Is_Breakout'].apply(lambda x: "🔥 Yes" if x else "-")
-                
-                # UI matches new logic
-                disp['Injury'] = disp['Injury_Severity'].apply(lambda x: "✅" if x == 'None' else ("🚨 Avoid" if x == 'Long' else ("⚠️ Mid-Term" if x == 'Mid' else "🩹 Short")))
-                
-                cols_to_show = ['full_name', 'positions', 'Score', 'Avg', 'Expert', 'Breakout', 'Injury']
-                st.dataframe(disp[cols_to_show].head(100), use_container_width=True, hide_index=True)
+            board = get_board_model(df, RATING_WEIGHTS)
+            ranked = board.ranked(ds.available, opt_scores, search) if 'Opt_Score' in avail_df.columns else pd.Series(dtype=float)
+            if not ranked.empty:
+                # Badges are formatted once at load; only the visible page is built and sent.
+                pages = board.page_count(ranked)
+                page = st.number_input("Page", min_value=1, max_value=pages, value=1, key=f"board_page_{search}_{pages}") if pages > 1 else 1
+                disp = board.page(ranked, page)
+                cols_to_show = ['full_name', 'positions', 'Score', 'Avg', 'Proj', 'Floor', 'Expert', 'Breakout', 'Injury']
+                fc = st.session_state.get('forecast')
+                if fc and fc[0] == draft_key:
+                    rows = df.index.get_indexer(disp.index)
+                    for pk, probs in zip(fc[1], fc[2]):
+                        disp[f"Avail @ Pick {pk}"] = (probs[rows] * 100).round().astype(int).astype(str) + "%"
+                        cols_to_show.append(f"Avail @ Pick {pk}")
+                st.dataframe(disp[cols_to_show], use_container_width=True, hide_index=True, column_config={c: st.column_config.NumberColumn(format="%.1f") for c in ("Avg", "Proj", "Floor")})
+                if pages > 1: st.caption(f"Showing {(page - 1) * PAGE_SIZE + 1}–{(page - 1) * PAGE_SIZE + len(disp)} of {len(ranked)} players")
             st.divider()
             cols = st.columns(4)
             for i, pos in enumerate(['DEF', 'MID', 'RUC', 'FWD']):
-                cur_c = sum(1 for d in st.session_state.draft_history if d['team'] == active_id and d['assigned_pos'] == pos)
+                cur_c = ds.count(active_id, pos)
                 rem = p[pos] - cur_c
                 cols[i].metric(pos, f"{cur_c}/{p[pos]}", delta=f"-{rem}" if rem > 0 else "FIELD FULL", delta_color="inverse" if rem > 0 else "normal")
 
-    with tabs[1]:
-        my_pks = [d for d in st.session_state.draft_history if d['team'] == p['my_slot']]
+    with tabs[1], perf.stage("tab_my_team"):
+        my_pks = ds.team_picks.get(p['my_slot'], [])
         if my_pks:
             inf_cols = st.columns(5)
             on_f, bnch, trk = {x: [] for x in ['DEF', 'MID', 'RUC', 'FWD']}, [], {x: 0 for x in ['DEF', 'MID', 'RUC', 'FWD']}
@@ -366,38 +391,42 @@ elif st.session_state.step == "draft":
                     st.write(f"**{cat}**")
                     for n in (on_f[cat] if cat != 'Bench' else bnch): st.info(n)
 
-    with tabs[2]:
+    with tabs[2], perf.stage("tab_log"):
         if st.session_state.draft_history:
             log_df = pd.DataFrame(st.session_state.draft_history).copy()
             log_df['team_name'] = log_df['team'].apply(get_team_name)
             st.dataframe(log_df[['pick', 'team_name', 'player', 'assigned_pos']].sort_values('pick', ascending=False), use_container_width=True, hide_index=True)
 
-    with tabs[3]:
-        all_t = []
-        for i in range(1, p['num_teams'] + 1):
-            t_pks = [d for d in st.session_state.draft_history if d['team'] == i]
-            all_t.append({"Team": get_team_name(i), "Total Avg": df[df['full_name'].isin([x['player'] for x in t_pks])]['Avg'].sum()})
-        if all_t: st.bar_chart(pd.DataFrame(all_t).set_index("Team")['Total Avg'])
+    with tabs[3], perf.stage("tab_analysis"):
+        standings = get_standings(p, ds)
+        all_t = [{"Team": get_team_name(s['team']), "Picks": s['picks'], "Projected Fielded": round(s['projected'], 1),
+                  "Best Fielded (Avg)": round(s['best'], 1), "Total Avg": s['whole']} for s in standings]
+        if all_t:
+            st.bar_chart(pd.DataFrame(all_t).set_index("Team")['Total Avg'])
+            st.subheader("📈 Projected Fielded Score")
+            st.caption("Best on-field lineup from each team's picks so far; dual-position players fill whichever slot scores most.")
+            st.dataframe(pd.DataFrame(all_t).drop(columns="Total Avg").sort_values("Projected Fielded", ascending=False), hide_index=True, use_container_width=True)
 
     if is_complete:
-        with tabs[4]:
+        with tabs[4], perf.stage("tab_final"):
             st.header("🏆 Final League Performance")
-            final_stats = []
-            for i in range(1, p['num_teams'] + 1):
-                t_pks = [d for d in st.session_state.draft_history if d['team'] == i]
-                f_score, w_score = 0.0, 0.0
-                for pos in ['DEF', 'MID', 'RUC', 'FWD']:
-                    p_list = [d['player'] for d in t_pks if d['assigned_pos'] == pos]
-                    p_avg = sorted(df[df['full_name'].isin(p_list)]['Avg'].tolist(), reverse=True)
-                    f_score += sum(p_avg[:p[pos]])
-                    w_score += sum(p_avg)
-                final_stats.append({
-                    "Team Name": get_team_name(i),
-                    "Combined Points (Fielded)": round(f_score, 1),
-                    "Combined Points (Whole Team)": round(w_score, 1)
-                })
+            standings = get_standings(p, ds)
+            final_stats = [{
+                "Team Name": get_team_name(s['team']),
+                "Combined Points (Fielded)": round(s['fielded'], 1),
+                "Best Fielded": round(s['best'], 1),
+                "Projected Fielded": round(s['projected'], 1),
+                "Combined Points (Whole Team)": round(s['whole'], 1)
+            } for s in standings]
             st.table(pd.DataFrame(final_stats).sort_values("Combined Points (Fielded)", ascending=False))
             st.divider()
-            for i in range(1, p['num_teams'] + 1):
-                with st.expander(f"📍 {get_team_name(i)} Full List"):
-                    st.dataframe(pd.DataFrame([d for d in st.session_state.draft_history if d['team'] == i])[['pick', 'player', 'assigned_pos']], hide_index=True)
+            for s in standings:
+                with st.expander(f"📍 {get_team_name(s['team'])} Full List"):
+                    team_df = pd.DataFrame(ds.team_picks[s['team']])[['pick', 'player', 'assigned_pos']]
+                    team_df['best_lineup'] = team_df['player'].map(dict(s['lineup'])).fillna("Bench")
+                    st.dataframe(team_df, hide_index=True)
+
+# --- 4. PERFORMANCE PANEL ---
+perf.finish_run()
+if perf_box is not None:
+    perf_box.dataframe(perf.summary(), hide_index=True, use_container_width=True)
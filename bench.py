@@ -0,0 +1,168 @@
+"""Benchmark suite for the headless draft engine.
+
+Times data load, a full auto-draft, per-pick recommendations and the final
+standings across league and bench sizes, on synthetic player pools scaled up
+from supercoach_data.csv. Results go to a JSON file; pass --compare with an
+older results file to flag regressions (non-zero exit).
+
+    python bench.py --out bench_results.json
+    python bench.py --quick --compare bench_results.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from draft_engine import DraftSimulator, DraftState, PlayerPool, Recommender, final_standings, get_current_turn, total_picks
+from player_data import DATA_FILES, load_players
+
+SCALES = (1, 2, 5, 10)
+LEAGUES = (8, 10, 14, 18)
+BENCHES = (0, 5, 8)
+BASE_PARAMS = {"my_slot": 1, "DEF": 4, "MID": 5, "RUC": 1, "FWD": 4}
+# Stats jittered on the synthetic copies, relative sd.
+JITTER_COLS = ['Avg', 'Last3_Avg', 'Last5_Avg', 'KickInAvg', 'CbaAvg']
+JITTER_SD = 0.08
+# A result slower than the baseline by this factor is reported as a regression.
+REGRESSION_RATIO = 1.25
+
+
+def synthetic_players(scale, seed=0, path=DATA_FILES["players"]):
+    """supercoach_data.csv repeated `scale` times; copies get distinct names and jittered stats."""
+    src = pd.read_csv(path)
+    rng = np.random.default_rng(seed)
+    copies = [src]
+    for k in range(1, scale):
+        c = src.copy()
+        c['last_name'] = c['last_name'].astype(str) + f" {k}"
+        for col in JITTER_COLS:
+            if col in c.columns:
+                vals = pd.to_numeric(c[col], errors='coerce')
+                c[col] = (vals * (1 + rng.normal(0.0, JITTER_SD, len(c)))).clip(lower=0).round(1)
+        copies.append(c)
+    return pd.concat(copies, ignore_index=True)
+
+
+def _timed(fn, repeat):
+    """(best seconds, last result) over `repeat` calls."""
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def bench_load(files, repeat):
+    secs, df = _timed(lambda: load_players(files), repeat)
+    pool_secs, pool = _timed(lambda: PlayerPool(df), repeat)
+    return {"load_s": secs, "pool_s": pool_secs}, df, pool
+
+
+def bench_draft(pool, p):
+    """Full auto-draft, timing the recommendation for whoever is on the clock before each pick."""
+    state = DraftState(pool, p['num_teams'], [])
+    sim, rec = DraftSimulator(pool, p, state), Recommender(pool, p)
+    rec_times, sim_time = [], 0.0
+    for n in range(1, total_picks(p) + 1):
+        team = get_current_turn(n, p['num_teams'])
+        t0 = time.perf_counter()
+        rec.opt_scores(state, team)
+        t1 = time.perf_counter()
+        choice = sim.best_pick(team)
+        if choice is None: break
+        state.append({"pick": n, "team": team, "player": pool.names[choice[0]], "assigned_pos": choice[1]})
+        sim_time += time.perf_counter() - t1
+        rec_times.append(t1 - t0)
+    standings_s, _ = _timed(lambda: final_standings(state, p), 1)
+    rec_ms = np.array(rec_times) * 1000
+    return {
+        "picks": len(state.history),
+        "auto_draft_s": sim_time,
+        "rec_ms_mean": float(rec_ms.mean()),
+        "rec_ms_p95": float(np.percentile(rec_ms, 95)),
+        "standings_s": standings_s,
+    }
+
+
+def run_suite(scales=SCALES, leagues=LEAGUES, benches=BENCHES, repeat=3, log=print):
+    results, tmp = [], tempfile.mkdtemp(prefix="sc_bench_")
+    try:
+        for scale in scales:
+            files = dict(DATA_FILES, players=os.path.join(tmp, f"players_x{scale}.csv"))
+            synthetic_players(scale).to_csv(files["players"], index=False)
+            load, df, pool = bench_load(files, repeat)
+            results.append({"bench": "load", "scale": scale, "players": len(df), **load})
+            log(f"load x{scale}: {len(df)} players in {load['load_s']:.3f}s")
+            for teams in leagues:
+                for bench in benches:
+                    p = dict(BASE_PARAMS, num_teams=teams, bench_size=bench)
+                    row = {"bench": "draft", "scale": scale, "players": len(df), "num_teams": teams, "bench_size": bench, **bench_draft(pool, p)}
+                    results.append(row)
+                    log(f"draft x{scale} {teams}t bench {bench}: {row['auto_draft_s']:.3f}s, rec {row['rec_ms_mean']:.2f}ms/pick")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+
+def _case(r):
+    return (r["bench"], r["scale"], r.get("num_teams"), r.get("bench_size"))
+
+
+def compare(results, baseline, ratio=REGRESSION_RATIO):
+    """Timings that got slower than `ratio` x the baseline's, as (case, metric, old, new)."""
+    old = {_case(r): r for r in baseline}
+    slow = []
+    for r in results:
+        prev = old.get(_case(r))
+        if prev is None: continue
+        for k, v in r.items():
+            if k.endswith(("_s", "_ms_mean", "_ms_p95")) and k in prev and prev[k] > 0 and v > prev[k] * ratio:
+                slow.append((_case(r), k, prev[k], v))
+    return slow
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scales", type=int, nargs="+", default=list(SCALES))
+    ap.add_argument("--teams", type=int, nargs="+", default=list(LEAGUES))
+    ap.add_argument("--benches", type=int, nargs="+", default=list(BENCHES))
+    ap.add_argument("--repeat", type=int, default=3, help="load timings keep the best of this many runs")
+    ap.add_argument("--quick", action="store_true", help="scales 1 and 10, 10 teams, bench 5")
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--compare", help="earlier results file to check for regressions")
+    args = ap.parse_args(argv)
+    if args.quick:
+        args.scales, args.teams, args.benches = [1, 10], [10], [5]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    results = run_suite(args.scales, args.teams, args.benches, args.repeat)
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+        "platform": platform.platform(), "cpus": os.cpu_count(),
+    }
+    with open(args.out, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=1)
+    print(f"Wrote {len(results)} results to {args.out}")
+
+    if baseline is not None:
+        slow = compare(results, baseline)
+        for case, metric, old, new in slow:
+            print(f"REGRESSION {case} {metric}: {old:.4f} -> {new:.4f}")
+        if slow:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
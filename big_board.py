@@ -0,0 +1,105 @@
+"""Big Board view model: display columns formatted once, an indexed name search and paging.
+
+Built once per player frame. A rerun only masks, sorts and formats the page
+it is about to show.
+"""
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZE = 100
+# Substrings up to this length are indexed directly; longer queries are
+# narrowed by their rarest n-gram and then checked in full.
+GRAM = 3
+_SEARCH_MEMO = 256
+
+INJURY_BADGES = {'None': "✅", 'Long': "🚨 Avoid", 'Mid': "⚠️ Mid-Term"}
+_NON_ALNUM = re.compile(r'[^0-9a-z ]+')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_name(text):
+    """Lowercase, accent- and punctuation-free form used for searching."""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).casefold()
+    return _SPACES.sub(' ', _NON_ALNUM.sub('', text)).strip()
+
+
+def board_columns(df):
+    """The static Big Board columns (projections plus Expert, Breakout and Injury badges)."""
+    expert = df['Expert_Rank'].to_numpy(dtype=float)
+    injury = df['Injury_Severity'].astype(str)
+    return pd.DataFrame({
+        'full_name': df['full_name'].to_numpy(),
+        'positions': df['positions'].to_numpy(),
+        'Avg': df['Avg'].to_numpy(),
+        'Proj': df['Proj_Score'].to_numpy(),
+        'Floor': df['Proj_Floor'].to_numpy(),
+        'Expert': [f"Top {int(x)}" if x != 999 else "-" for x in expert],
+        'Breakout': np.where(df['Is_Breakout'].to_numpy(dtype=bool), "🔥 Yes", "-"),
+        'Injury': injury.map(INJURY_BADGES).fillna("🩹 Short").to_numpy(),
+    }, index=df.index)
+
+
+class BoardModel:
+    """Rows are positional (the same order as the player frame and PlayerPool)."""
+
+    def __init__(self, df):
+        self.static = board_columns(df)
+        self.size = len(df)
+        self.norm = [normalize_name(n) for n in df['full_name']]
+        grams = {}
+        for row, name in enumerate(self.norm):
+            seen = {name[i:i + k] for k in range(1, GRAM + 1) for i in range(len(name) - k + 1)}
+            for g in seen:
+                grams.setdefault(g, []).append(row)
+        self.grams = {g: np.array(rows) for g, rows in grams.items()}
+        names = df['full_name'].astype(str).to_numpy()
+        order = np.argsort(names, kind='stable')
+        self.name_order, self.sorted_names = order, names[order]
+        self._memo = {}
+
+    def search(self, query):
+        """Rows whose normalized name contains the normalized query, ascending; None means no filter."""
+        q = normalize_name(query)
+        if not q:
+            return None
+        if q not in self._memo:
+            if len(q) <= GRAM:
+                rows = self.grams.get(q, np.empty(0, dtype=int))
+            else:
+                cands = min((self.grams.get(q[i:i + GRAM], np.empty(0, dtype=int)) for i in range(len(q) - GRAM + 1)), key=len)
+                rows = np.array([r for r in cands if q in self.norm[r]], dtype=int)
+            if len(self._memo) >= _SEARCH_MEMO:
+                self._memo.clear()
+            self._memo[q] = rows
+        return self._memo[q]
+
+    def names_available(self, available):
+        """Available player names in sorted order, for the pick selectbox."""
+        return self.sorted_names[available[self.name_order]].tolist()
+
+    def ranked(self, available, scores, query=""):
+        """Matching available rows, best Opt_Score first."""
+        mask = available.copy()
+        rows = self.search(query)
+        if rows is not None:
+            hit = np.zeros(self.size, dtype=bool)
+            hit[rows] = True
+            mask &= hit
+        rows = np.flatnonzero(mask)
+        # Same sort as the old frame-level sort_values, so tied scores keep their order.
+        return pd.Series(scores[rows], index=rows).sort_values(ascending=False)
+
+    def page(self, ranked, page=1, page_size=PAGE_SIZE):
+        """Display frame for one page of ranked rows, with the formatted Score column."""
+        chunk = ranked.iloc[(page - 1) * page_size:page * page_size]
+        disp = self.static.iloc[chunk.index.to_numpy()].copy()
+        disp.insert(2, 'Score', [("FULL" if x <= -500 else round(x, 1)) for x in chunk.to_numpy()])
+        return disp
+
+    @staticmethod
+    def page_count(ranked, page_size=PAGE_SIZE):
+        return max(1, -(-len(ranked) // page_size))
@@ -0,0 +1,146 @@
+"""Bulk pick ingestion: parse a pasted list or CSV export of picks, match names and validate them.
+
+Nothing is applied here. plan_picks() replays the batch against a scratch
+DraftState so roster limits and snake order are checked pick by pick, and
+the caller applies the accepted picks in one go.
+"""
+import csv
+import difflib
+import io
+
+from big_board import normalize_name
+from draft_engine import POSITIONS, DraftState, check_roster_limit, get_current_turn
+
+POS_ALIASES = {
+    "D": "DEF", "DEF": "DEF", "DEFENDER": "DEF", "DEFENCE": "DEF",
+    "M": "MID", "MID": "MID", "MIDFIELDER": "MID", "MIDFIELD": "MID",
+    "R": "RUC", "RUC": "RUC", "RUCK": "RUC", "RUCKMAN": "RUC",
+    "F": "FWD", "FWD": "FWD", "FORWARD": "FWD",
+}
+PLAYER_HEADERS = {"player", "name", "full_name", "player_name", "playername"}
+POSITION_HEADERS = {"position", "pos", "assigned_pos"}
+TEAM_HEADERS = {"team", "team_name", "coach", "owner"}
+# difflib ratio a fuzzy name match must reach.
+MATCH_CUTOFF = 0.8
+
+
+def parse_positions(text):
+    """Positions named by a cell such as "MID", "Mids" or "DEF/MID", in order; None if any part is unknown."""
+    parts = [POS_ALIASES.get(part.strip().upper().rstrip("S")) for part in text.split("/")]
+    return None if None in parts else list(dict.fromkeys(parts))
+
+
+def parse_picks(text):
+    """Rows of {line, player, position, team} from 'player, position' lines or a CSV with a header row."""
+    lines = [ln for ln in text.splitlines() if ln.strip()]
+    if not lines:
+        return []
+    sample = "\n".join(lines[:20])
+    delim = max(",\t;|", key=sample.count) if any(d in sample for d in ",\t;|") else ","
+    rows = list(csv.reader(io.StringIO("\n".join(lines)), delimiter=delim, skipinitialspace=True))
+    header = [h.strip().lower().replace(" ", "_") for h in rows[0]]
+    col = {"player": 0, "position": 1, "team": None}
+    first = 0
+    if PLAYER_HEADERS & set(header):
+        col = {key: next((i for i, h in enumerate(header) if h in names), None)
+               for key, names in (("player", PLAYER_HEADERS), ("position", POSITION_HEADERS), ("team", TEAM_HEADERS))}
+        first = 1
+    picks = []
+    for n, row in enumerate(rows[first:], start=first + 1):
+        cells = [c.strip() for c in row]
+        # Headerless lines may lead with a pick number ("12, Nick Daicos, MID").
+        if first == 0 and len(cells) > 1 and cells[0].isdigit():
+            cells = cells[1:]
+        # ...or be space separated with the position last ("Nick Daicos MID").
+        if first == 0 and len(cells) == 1 and " " in cells[0]:
+            head, _, last = cells[0].rpartition(" ")
+            if parse_positions(last):
+                cells = [head, last]
+        get = lambda key: cells[col[key]] if col[key] is not None and col[key] < len(cells) else ""
+        if get("player"):
+            picks.append({"line": n, "player": get("player"), "position": get("position"), "team": get("team")})
+    return picks
+
+
+class NameMatcher:
+    """Maps typed or exported player names onto PlayerPool names."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.by_norm, self.by_initial = {}, {}
+        for name in pool.rows_by_name:
+            norm = normalize_name(name)
+            self.by_norm.setdefault(norm, name)
+            parts = norm.split(" ")
+            if len(parts) > 1:
+                self.by_initial.setdefault(f"{parts[0][0]} {' '.join(parts[1:])}", []).append(name)
+        self.norms = list(self.by_norm)
+
+    def match(self, text):
+        """(full_name, exact?) for the closest player, or (None, False)."""
+        norm = normalize_name(text)
+        if norm in self.by_norm:
+            return self.by_norm[norm], True
+        # "N Daicos" / "N. Daicos" style exports, when the initial is unambiguous
+        hits = self.by_initial.get(norm, [])
+        if len(hits) == 1:
+            return hits[0], False
+        close = difflib.get_close_matches(norm, self.norms, n=1, cutoff=MATCH_CUTOFF)
+        return (self.by_norm[close[0]], False) if close else (None, False)
+
+
+def _team_matches(given, team, team_names):
+    given = given.strip().lower()
+    return not given or given == str(team) or given == team_names.get(str(team), f"Team {team}").strip().lower()
+
+
+def plan_picks(entries, state, p, matcher, team_names=None, total_picks=None):
+    """Validate a batch in draft order against a copy of the state.
+
+    Returns (picks, report): the history entries for every pick up to the first
+    problem, and one report row per input row with its match and status.
+    """
+    team_names = team_names or {}
+    scratch = DraftState(state.pool, state.num_teams, list(state.history))
+    picks, report, failed = [], [], False
+    for e in entries:
+        pick_no = scratch.next_pick
+        team = get_current_turn(pick_no, p['num_teams'])
+        name, exact = matcher.match(e["player"])
+        row = {"Line": e["line"], "Input": e["player"], "Player": name or "", "Pick": pick_no, "Team": team_names.get(str(team), f"Team {team}"), "Pos": ""}
+        status = None
+        if failed:
+            status = "skipped"
+        elif total_picks is not None and pick_no > total_picks:
+            status = "draft already complete"
+        elif name is None:
+            status = "no matching player"
+        elif scratch.is_taken(name):
+            status = "already drafted"
+        elif not _team_matches(e.get("team", ""), team, team_names):
+            status = f"out of snake order (pick {pick_no} belongs to {row['Team']})"
+        else:
+            elig = [pos for j, pos in enumerate(POSITIONS) if state.pool.elig[state.pool.rows_for(name)[0], j]]
+            # A position cell may list several positions (an export of the player's "DEF/MID");
+            # any of them that the player is eligible at will do.
+            given = parse_positions(e["position"]) if e["position"] else elig
+            options = [x for x in elig if x in (given or [])]
+            if given is None:
+                status = f"unknown position '{e['position']}'"
+            elif not options:
+                status = f"not eligible at {'/'.join(given)} ({'/'.join(elig)})"
+            else:
+                pos = next((x for x in options if check_roster_limit(x, team, p, scratch)), None)
+                if pos is None:
+                    status = f"roster full at {'/'.join(options)}"
+        if status is None:
+            row["Pos"] = pos
+            status = "ok" if exact else "ok (fuzzy match)"
+            pick = {"pick": pick_no, "team": team, "player": name, "assigned_pos": pos}
+            scratch.append(pick)
+            picks.append(pick)
+        elif status != "skipped":
+            failed = True
+        row["Status"] = status
+        report.append(row)
+    return picks, report
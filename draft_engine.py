@@ -0,0 +1,466 @@
+"""Array-backed draft engine for the Supercoach War Room.
+
+Player data is converted to NumPy arrays once so that simulated picks are
+vectorised argmax calls instead of pandas copies and row loops. Nothing here
+touches Streamlit: the app, tune_weights.py and bench.py all drive the same
+engine (turn order, roster limits, sims, Opt_Score and final standings).
+"""
+import numpy as np
+
+from player_data import as_float64
+
+POSITIONS = ['DEF', 'MID', 'RUC', 'FWD']
+POS_INDEX = {pos: i for i, pos in enumerate(POSITIONS)}
+
+# AI opponent heuristic: positional cost multiplier, need bonus, over-position
+# penalty, breakout rebate and the scarcity depth beyond num_teams.
+SIM_WEIGHTS = {"cost": 0.4, "need": 5.0, "over": -25.0, "breakout": 40.0, "depth": 2}
+
+
+def get_current_turn(curr_pick, total_teams):
+    if total_teams <= 0: return 1
+    rnd = ((curr_pick - 1) // total_teams) + 1
+    if rnd % 2 != 0: return (curr_pick - 1) % total_teams + 1
+    return total_teams - ((curr_pick - 1) % total_teams)
+
+
+def total_picks(p):
+    """Picks in a full draft: every team fills its field spots and bench."""
+    return p['num_teams'] * (sum(p[pos] for pos in POSITIONS) + p.get('bench_size', 5))
+
+
+def roster_caps(p):
+    """Most players a team may assign to each position (field spots plus a bench share)."""
+    extra = p.get('bench_size', 5) // 2 + 1
+    return np.array([p.get('RUC', 1) if pos == 'RUC' else p.get(pos, 0) + extra for pos in POSITIONS])
+
+
+class PlayerPool:
+    """Static per-player arrays built once from the loaded dataframe (row order preserved).
+
+    `rating` picks the column every ranking runs on: Power_Rating, or its
+    risk-adjusted twin Risk_Rating.
+    """
+
+    def __init__(self, df, rating='Power_Rating'):
+        self.size, self.rating = len(df), rating
+        self.names = df['full_name'].astype(str).to_numpy()
+        self.power = df[rating].to_numpy(dtype=float)
+        self.avg = as_float64(df['Avg'])
+        self.proj = as_float64(df['Proj_Score']) if 'Proj_Score' in df.columns else self.avg
+        self.breakout = df['Is_Breakout'].to_numpy(dtype=bool)
+        positions = df['positions'].astype(object).fillna('').astype(str)
+        tokens = positions.str.split('/')
+        # Eligibility follows positions.split('/'); cost pools follow str.contains, as in app.py.
+        self.elig = np.column_stack([tokens.map(lambda t, pos=pos: pos in t).to_numpy(dtype=bool) for pos in POSITIONS])
+        self.in_pool = np.column_stack([positions.str.contains(pos, regex=False).to_numpy(dtype=bool) for pos in POSITIONS])
+        order = np.argsort(-self.power, kind='stable')
+        self.rank_orders = [order[self.in_pool[order, j]] for j in range(len(POSITIONS))]
+        rows = {}
+        for i, name in enumerate(self.names):
+            rows.setdefault(name, []).append(i)
+        self.rows_by_name = {name: np.array(idx) for name, idx in rows.items()}
+        self.name_ids = np.empty(self.size, dtype=int)
+        for k, idx in enumerate(self.rows_by_name.values()):
+            self.name_ids[idx] = k
+
+    def rows_for(self, name):
+        return self.rows_by_name.get(name, np.empty(0, dtype=int))
+
+    def row_for(self, name):
+        """The row a pick of `name` scores from: the first, as some players are listed twice; None if unknown."""
+        rows = self.rows_for(name)
+        return int(rows[0]) if len(rows) else None
+
+
+def check_roster_limit(chosen_pos, team_id, p, state):
+    count = state.count(team_id, chosen_pos)
+    if chosen_pos == "RUC":
+        return count < p.get('RUC', 1)
+    return count < (p.get(chosen_pos, 0) + (p.get('bench_size', 5) // 2 + 1))
+
+
+class DraftState:
+    """Incrementally maintained view of draft_history.
+
+    Wraps the history list itself (the object that gets persisted) and keeps
+    per-team positional counters, a taken-row mask and per-team pick lists in
+    step with it, so roster checks and availability are O(1) lookups.
+    """
+
+    def __init__(self, pool, num_teams, history):
+        self.pool, self.num_teams, self.history = pool, num_teams, history
+        self.taken = np.zeros(pool.size, dtype=bool)
+        self.counts = np.zeros((num_teams + 1, len(POSITIONS)), dtype=int)
+        self.team_picks = {t: [] for t in range(1, num_teams + 1)}
+        # Bumped on every pick / undo of a team, so derived per-team views can refresh just that team.
+        self.team_versions = np.zeros(num_teams + 1, dtype=np.int64)
+        self._name_counts = {}
+        for d in history:
+            self._apply(d)
+
+    def _apply(self, d):
+        name = d['player']
+        self._name_counts[name] = self._name_counts.get(name, 0) + 1
+        self.taken[self.pool.rows_for(name)] = True
+        self.team_picks.setdefault(d['team'], []).append(d)
+        if 0 <= d['team'] <= self.num_teams:
+            self.team_versions[d['team']] += 1
+        if d.get('assigned_pos') in POS_INDEX and 0 <= d['team'] <= self.num_teams:
+            self.counts[d['team'], POS_INDEX[d['assigned_pos']]] += 1
+
+    def _revert(self, d):
+        name = d['player']
+        self._name_counts[name] -= 1
+        if not self._name_counts[name]:
+            del self._name_counts[name]
+            self.taken[self.pool.rows_for(name)] = False
+        self.team_picks[d['team']].pop()
+        if 0 <= d['team'] <= self.num_teams:
+            self.team_versions[d['team']] += 1
+        if d.get('assigned_pos') in POS_INDEX and 0 <= d['team'] <= self.num_teams:
+            self.counts[d['team'], POS_INDEX[d['assigned_pos']]] -= 1
+
+    def in_sync(self, history, pool, num_teams):
+        return self.history is history and self.pool is pool and self.num_teams == num_teams and sum(self._name_counts.values()) == len(history)
+
+    def append(self, pick):
+        self.history.append(pick)
+        self._apply(pick)
+
+    def extend(self, picks):
+        for d in picks:
+            self.append(d)
+
+    def pop(self):
+        d = self.history.pop()
+        self._revert(d)
+        return d
+
+    def is_taken(self, name):
+        return name in self._name_counts
+
+    def count(self, team, pos):
+        if pos not in POS_INDEX or not 0 <= team <= self.num_teams:
+            return sum(1 for d in self.team_picks.get(team, []) if d.get('assigned_pos') == pos)
+        return int(self.counts[team, POS_INDEX[pos]])
+
+    def team_counts(self, team):
+        return {pos: self.count(team, pos) for pos in POSITIONS}
+
+    @property
+    def available(self):
+        return ~self.taken
+
+    @property
+    def next_pick(self):
+        return len(self.history) + 1
+
+
+class SimState:
+    """Copyable draft state for search and headless drafts: taken mask, counters and rosters only.
+
+    Quacks like DraftState as far as DraftSimulator is concerned, without
+    carrying the pick history around.
+    """
+
+    def __init__(self, pool, num_teams, taken, counts, next_pick, rosters):
+        self.pool, self.num_teams = pool, num_teams
+        self.taken, self.counts, self.next_pick, self.rosters = taken, counts, next_pick, rosters
+
+    @classmethod
+    def empty(cls, pool, num_teams):
+        return cls(pool, num_teams, np.zeros(pool.size, dtype=bool), np.zeros((num_teams + 1, len(POSITIONS)), dtype=int),
+                   1, {t: [] for t in range(1, num_teams + 1)})
+
+    @classmethod
+    def from_draft(cls, state):
+        rosters = {t: [] for t in range(1, state.num_teams + 1)}
+        for team, picks in state.team_picks.items():
+            for d in picks:
+                rows = state.pool.rows_for(d['player'])
+                if len(rows) and d.get('assigned_pos') in POS_INDEX:
+                    rosters.setdefault(team, []).append((int(rows[0]), POS_INDEX[d['assigned_pos']]))
+        return cls(state.pool, state.num_teams, state.taken.copy(), state.counts.copy(), state.next_pick, rosters)
+
+    def copy(self):
+        return SimState(self.pool, self.num_teams, self.taken.copy(), self.counts.copy(), self.next_pick,
+                        {t: list(r) for t, r in self.rosters.items()})
+
+    def append(self, pick):
+        rows = self.pool.rows_for(pick['player'])
+        self.taken[rows] = True
+        j = POS_INDEX[pick['assigned_pos']]
+        self.counts[pick['team'], j] += 1
+        if len(rows):
+            self.rosters.setdefault(pick['team'], []).append((int(rows[0]), j))
+        self.next_pick += 1
+
+    @property
+    def available(self):
+        return ~self.taken
+
+
+def fielded_total(pool, roster, p, values=None):
+    """Final Teams 'Fielded' metric for a roster of (row, position index): best p[pos] Avgs per position.
+
+    `values` swaps in another per-row score for Avg, e.g. pool.proj.
+    """
+    values = pool.avg if values is None else values
+    total = 0.0
+    for j, pos in enumerate(POSITIONS):
+        vals = sorted((values[r] for r, k in roster if k == j), reverse=True)
+        total += sum(vals[:p.get(pos, 0)])
+    return total
+
+
+def team_standing(state, p, team):
+    """Final Teams row for one team: 'fielded' (best p[pos] Avgs per assigned position) and 'whole' (every pick)."""
+    f_score, w_score = 0.0, 0.0
+    rows = [(state.pool.row_for(d['player']), d['assigned_pos']) for d in state.team_picks.get(team, [])]
+    for pos in POSITIONS:
+        p_avg = sorted((state.pool.avg[r] for r, k in rows if k == pos and r is not None), reverse=True)
+        f_score += sum(p_avg[:p[pos]])
+        w_score += sum(p_avg)
+    return {"team": team, "fielded": f_score, "whole": w_score}
+
+
+def final_standings(state, p):
+    return [team_standing(state, p, team) for team in range(1, state.num_teams + 1)]
+
+
+class DraftSimulator:
+    """AI opponent picks computed from a DraftState's arrays."""
+
+    def __init__(self, pool, p, state, weights=SIM_WEIGHTS):
+        self.pool, self.p, self.state, self.weights = pool, p, state, weights
+        self.num_teams = p['num_teams']
+        self.caps = roster_caps(p)
+        self.targets = np.array([p.get(pos, 0) for pos in POSITIONS])
+
+    def position_costs(self):
+        depth = self.num_teams + self.weights['depth']
+        costs = np.zeros(len(POSITIONS))
+        available = self.state.available
+        for j, order in enumerate(self.pool.rank_orders):
+            live = order[available[order]]
+            if len(live) > depth:
+                costs[j] = self.pool.power[live[0]] - self.pool.power[live[depth]]
+        return costs
+
+    def pick_scores(self, team):
+        """(players x positions) heuristic scores, -inf where the pick is not allowed."""
+        w, pool, counts = self.weights, self.pool, self.state.counts[team]
+        need = counts < self.targets
+        scores = pool.power[:, None] + self.position_costs() * w['cost']
+        scores = scores + np.where(need, w['need'], w['over'])
+        scores = scores + np.where(need, 0.0, pool.breakout[:, None] * w['breakout'])
+        allowed = pool.elig & (counts < self.caps) & ~self.state.taken[:, None]
+        return np.where(allowed, scores, -np.inf)
+
+    def best_pick(self, team):
+        """(row, position) the AI would take for team, or None when nothing is legal."""
+        scores = self.pick_scores(team)
+        flat = int(np.argmax(scores))
+        if not scores.flat[flat] > -9999.0:
+            return None
+        row, j = divmod(flat, len(POSITIONS))
+        return row, POSITIONS[j]
+
+    def sim_to_slot(self, my_slot, total_picks):
+        """Auto-draft into the state until my_slot is on the clock; returns the new picks."""
+        picks, state = [], self.state
+        while state.next_pick <= total_picks:
+            team = get_current_turn(state.next_pick, self.num_teams)
+            if team == my_slot or state.taken.all(): break
+            choice = self.best_pick(team)
+            if choice is None: break
+            row, pos = choice
+            pick = {"pick": state.next_pick, "team": team, "player": self.pool.names[row], "assigned_pos": pos}
+            state.append(pick)
+            picks.append(pick)
+        return picks
+
+
+def auto_draft(pool, p, history=None, weights=SIM_WEIGHTS):
+    """Finish a draft headlessly with every team (mine included) on the sim heuristic; returns its DraftState."""
+    state = DraftState(pool, p['num_teams'], [] if history is None else history)
+    DraftSimulator(pool, p, state, weights).sim_to_slot(None, total_picks(p))
+    return state
+
+
+def roster_key(p):
+    """The settings that shape recommendations: league size, field spots and bench."""
+    return (p['num_teams'], p.get('bench_size', 5)) + tuple(p.get(pos, 0) for pos in POSITIONS)
+
+
+class Recommender:
+    """Opt_Score for the team on the clock, kept current across reruns.
+
+    Scores are cached on the active team, the taken mask and that team's
+    positional counts, so any pick or undo (even one that re-takes the same
+    player at another position) invalidates them. When the draft moves on,
+    only the positional costs whose pools lost or regained a player are
+    recomputed, and only the need / over bonuses of the teams whose rosters
+    changed.
+    """
+
+    def __init__(self, pool, p, weights=SIM_WEIGHTS):
+        self.pool, self.p, self.weights = pool, p, weights
+        self.params = roster_key(p)
+        self.depth = p['num_teams'] + weights['depth']
+        self.caps = roster_caps(p)
+        self.targets = np.array([p.get(pos, 0) for pos in POSITIONS])
+        self.taken = np.zeros(pool.size, dtype=bool)
+        self.counts = np.zeros((p['num_teams'] + 1, len(POSITIONS)), dtype=int)
+        self.costs = np.zeros(len(POSITIONS))
+        self.base = np.repeat(pool.power[:, None], len(POSITIONS), axis=1)
+        for j in range(len(POSITIONS)):
+            self._refresh_cost(j)
+        self._bonus = {}
+        self.key, self.scores = None, None
+
+    def _refresh_cost(self, j):
+        live = self.pool.rank_orders[j]
+        live = live[~self.taken[live]]
+        self.costs[j] = self.pool.power[live[0]] - self.pool.power[live[self.depth]] if len(live) > self.depth else 0
+        self.base[:, j] = self.pool.power + self.costs[j] * self.weights['cost']
+
+    def _team_bonus(self, team):
+        if team not in self._bonus:
+            w, need = self.weights, self.counts[team] < self.targets
+            self._bonus[team] = np.where(need, w['need'], w['over'] + self.pool.breakout[:, None] * w['breakout'])
+        return self._bonus[team]
+
+    def sync(self, state):
+        """Apply whatever picks / undos happened in state since the last call."""
+        changed = self.taken != state.taken
+        if changed.any():
+            self.taken[changed] = state.taken[changed]
+            for j in np.flatnonzero(self.pool.in_pool[changed].any(axis=0)):
+                self._refresh_cost(j)
+        for team in np.flatnonzero((self.counts != state.counts).any(axis=1)):
+            self.counts[team] = state.counts[team]
+            self._bonus.pop(int(team), None)
+
+    def opt_scores(self, state, team):
+        """Opt_Score per pool row for team: best legal position's score, -999 when none is legal."""
+        key = (team, state.taken.tobytes(), state.counts[team].tobytes())
+        if key != self.key:
+            self.sync(state)
+            allowed = self.pool.elig & (self.counts[team] < self.caps) & ~self.taken[:, None]
+            best = np.where(allowed, self.base + self._team_bonus(team), -np.inf).max(axis=1)
+            # -999 floors the score as the app's max([...] + [-999]) did.
+            self.key, self.scores = key, np.maximum(best, -999.0)
+        return self.scores
+
+
+def _static_queues(order, mask, sentinel):
+    """Per-draft rows satisfying mask in rating order, padded with a trailing sentinel column."""
+    member = np.take_along_axis(np.broadcast_to(mask, order.shape), order, axis=1)
+    rank = member.cumsum(axis=1) - 1
+    width = int(rank[:, -1].max()) + 1 if member.size else 0
+    queues = np.full((len(order), width + 1), sentinel)
+    r, c = np.nonzero(member)
+    queues[r, rank[r, c]] = order[r, c]
+    return queues
+
+
+class BatchDraft:
+    """Many independent drafts of one league stepped in lockstep with NumPy, one row per draft.
+
+    Each draft may have its own ratings (e.g. noisy Power_Rating) and per-team
+    heuristic weights: `weights` maps cost to (drafts, teams + 1, positions) and
+    need / over / breakout / depth to (drafts, teams + 1) arrays. Ratings are
+    fixed per draft, so every positional queue is sorted once up front and the
+    best live player is found by advancing a pointer, as availability only
+    ever shrinks. Picks match DraftSimulator's, tie-breaks included.
+    """
+
+    def __init__(self, pool, p, ratings, weights, available=None, counts=None):
+        self.pool, self.p, self.weights = pool, p, weights
+        self.num_teams = p['num_teams']
+        self.caps = roster_caps(p)
+        self.targets = np.array([p.get(pos, 0) for pos in POSITIONS])
+        drafts, n = ratings.shape
+        self.n, self.idx = n, np.arange(drafts)
+        self.ratings = np.concatenate([ratings, np.full((drafts, 1), -np.inf)], axis=1)
+        start = np.ones(n, dtype=bool) if available is None else available
+        self.avail = np.zeros((drafts, n + 1), dtype=bool)
+        self.avail[:, :n] = start
+        self.counts = np.zeros((drafts, self.num_teams + 1, len(POSITIONS)), dtype=int)
+        if counts is not None:
+            self.counts[:] = counts
+        self.ids = np.append(pool.name_ids, -1)
+        order = np.argsort(-ratings, axis=1, kind='stable')
+        self.cost_queues = [_static_queues(order, start & pool.in_pool[:, j], n) for j in range(len(POSITIONS))]
+        self.pick_queues = [_static_queues(order, start & (pool.elig[:, j] & (pool.breakout == brk)), n)
+                            for j in range(len(POSITIONS)) for brk in (False, True)]
+        self.cost_ptrs = [np.zeros(drafts, dtype=int) for _ in self.cost_queues]
+        self.pick_ptrs = [np.zeros(drafts, dtype=int) for _ in self.pick_queues]
+        self.window = np.arange(int(weights['depth'].max()) + self.num_teams + 17)
+
+    @staticmethod
+    def uniform_weights(weights, drafts, num_teams):
+        """Per-draft, per-team weight arrays with every team on the same heuristic weights."""
+        shape = (drafts, num_teams + 1)
+        out = {k: np.full(shape, weights[k], dtype=float) for k in ('need', 'over', 'breakout')}
+        out['cost'] = np.full(shape + (len(POSITIONS),), weights['cost'], dtype=float)
+        out['depth'] = np.full(shape, weights['depth'], dtype=int)
+        return out
+
+    def _first_live(self, queue, ptr):
+        while True:
+            rows = queue[self.idx, ptr]
+            dead = ~self.avail[self.idx, rows] & (rows < self.n)
+            if not dead.any():
+                return rows
+            ptr[dead] += 1
+
+    def _nth_live(self, queue, ptr, depth):
+        """Row of the depth-th live entry at or after ptr, scanning a short window first."""
+        last = queue.shape[1] - 1
+        cols = np.minimum(ptr[:, None] + self.window, last)
+        rows = queue[self.idx[:, None], cols]
+        seen = self.avail[self.idx[:, None], rows].cumsum(axis=1)
+        nth = rows[self.idx, np.argmax(seen > depth[:, None], axis=1)]
+        deep = seen[:, -1] > depth
+        short = ~deep & (cols[:, -1] < last)
+        if short.any():
+            sub = self.idx[short]
+            seen = np.take_along_axis(self.avail[sub], queue[sub], axis=1).cumsum(axis=1)
+            nth[short] = queue[sub, np.argmax(seen > depth[short, None], axis=1)]
+            deep[short] = seen[:, -1] > depth[short]
+        return nth, deep
+
+    def step(self, team):
+        """One pick for `team` in every draft; returns (rows, position indices, valid mask)."""
+        w, idx, n, n_pos = self.weights, self.idx, self.n, len(POSITIONS)
+        depth = self.num_teams + w['depth'][:, team]
+        costs = np.zeros((len(idx), n_pos))
+        for j, (queue, ptr) in enumerate(zip(self.cost_queues, self.cost_ptrs)):
+            top = self._first_live(queue, ptr)
+            kth, deep = self._nth_live(queue, ptr, depth)
+            costs[:, j] = np.where(deep, self.ratings[idx, top] - self.ratings[idx, kth], 0.0)
+        c = self.counts[:, team]
+        need = c < self.targets
+        cost_part = costs * w['cost'][:, team]
+        bonus = np.where(need, w['need'][:, team, None], w['over'][:, team, None])
+        cand_score = np.full((len(idx), 2 * n_pos), -np.inf)
+        cand_row = np.full((len(idx), 2 * n_pos), n)
+        for q, (queue, ptr) in enumerate(zip(self.pick_queues, self.pick_ptrs)):
+            j, brk = divmod(q, 2)
+            row = self._first_live(queue, ptr)
+            score = self.ratings[idx, row] + cost_part[:, j] + bonus[:, j]
+            if brk: score = score + np.where(need[:, j], 0.0, w['breakout'][:, team])
+            cand_score[:, q] = np.where((c[:, j] < self.caps[j]) & (row < n), score, -np.inf)
+            cand_row[:, q] = row
+        best = cand_score.max(axis=1, keepdims=True)
+        # Ties resolve like a row-major argmax over (player, position).
+        key = np.where(cand_score == best, cand_row * n_pos + np.arange(2 * n_pos) // 2, np.iinfo(np.int64).max)
+        rows, pos = np.divmod(key.min(axis=1), n_pos)
+        valid = best[:, 0] > -9999.0
+        rows = np.where(valid, rows, n)
+        self.avail &= ~((self.ids[None, :] == self.ids[rows][:, None]) & valid[:, None])
+        self.counts[idx[valid], team, pos[valid]] += 1
+        return rows, pos, valid
@@ -0,0 +1,262 @@
+"""Crash-safe draft persistence: an append-only pick/undo journal plus compacted snapshots.
+
+Each draft lives in drafts/<draft_id>/ as snapshot.json (generation g) and
+journal-<g>.jsonl. Journal lines are appended and fsynced one batch at a
+time; snapshots are written to a temp file, fsynced and renamed into place,
+and only then does a new journal generation start, so a crash at any point
+leaves a consistent snapshot + journal pair to replay.
+
+Several sessions may open the same draft ID. Every read and write happens
+under a per-draft lock, and a store only writes if the files are exactly as
+it last left them; otherwise sync() raises DraftConflict and the caller
+reloads instead of interleaving its picks with another session's.
+"""
+import contextlib
+import copy
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still covers sessions of one server
+    fcntl = None
+
+DRAFTS_DIR = 'drafts'
+LEGACY_SAVE_FILE = "draft_state.json"
+# Compact once the journal holds this many entries or as many as the history, whichever is larger.
+SNAPSHOT_MIN_ENTRIES = 50
+
+_VALID_ID = re.compile(r'[A-Za-z0-9_-]{1,64}')
+_LOCKS, _LOCKS_GUARD = {}, threading.Lock()
+
+
+class DraftConflict(Exception):
+    """The draft on disk was changed by another session since this store last read or wrote it."""
+
+
+def clean_draft_id(draft_id):
+    """The draft ID if it is safe to use as a directory name, else None."""
+    draft_id = str(draft_id or '').strip()
+    return draft_id if _VALID_ID.fullmatch(draft_id) else None
+
+
+def new_draft_id():
+    return uuid.uuid4().hex[:10]
+
+
+def saved_drafts(root=DRAFTS_DIR):
+    """IDs of the drafts saved under root, most recently written first."""
+    found = []
+    for draft_id in os.listdir(root) if os.path.isdir(root) else []:
+        folder = os.path.join(root, draft_id)
+        if clean_draft_id(draft_id) and os.path.exists(os.path.join(folder, "snapshot.json")):
+            found.append((max(os.path.getmtime(os.path.join(folder, name)) for name in os.listdir(folder)), draft_id))
+    return [draft_id for _, draft_id in sorted(found, reverse=True)]
+
+
+@contextlib.contextmanager
+def _draft_lock(path):
+    """Exclusive access to one draft directory: a thread lock for the sessions of this
+    process (Streamlit runs them all in one), plus flock against other processes."""
+    with _LOCKS_GUARD:
+        lock = _LOCKS.setdefault(os.path.abspath(path), threading.Lock())
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _fsync_dir(path):
+    if not hasattr(os, 'O_DIRECTORY'): return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _atomic_write_json(path, data):
+    folder = os.path.dirname(path) or '.'
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".snapshot-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+    _fsync_dir(folder)
+
+
+class DraftStore:
+    """Persistence for one draft ID; sync() journals only what changed since the last call."""
+
+    def __init__(self, draft_id, root=DRAFTS_DIR):
+        self.draft_id = clean_draft_id(draft_id) or new_draft_id()
+        self.dir = os.path.join(root, self.draft_id)
+        self.snapshot_path = os.path.join(self.dir, "snapshot.json")
+        self.gen = 0
+        self._meta, self._history, self._entries = None, [], 0
+        # (generation, journal size) as this store last saw them on disk; None when there was no draft.
+        self._seen = None
+
+    @property
+    def journal_path(self):
+        return os.path.join(self.dir, f"journal-{self.gen}.jsonl")
+
+    def exists(self):
+        return os.path.exists(self.snapshot_path)
+
+    def _on_disk(self):
+        """(generation, journal size) of the files as they are now, or None without a snapshot."""
+        if not self.exists():
+            return None
+        with open(self.snapshot_path, "r") as f:
+            gen = json.load(f).get("gen", 0)
+        journal = os.path.join(self.dir, f"journal-{gen}.jsonl")
+        return gen, os.path.getsize(journal) if os.path.exists(journal) else 0
+
+    def load(self):
+        """Latest snapshot with its journal replayed, as {step, draft_history, team_names, params}; None if absent."""
+        if not self.exists():
+            self._meta, self._history, self._entries, self.gen, self._seen = None, [], 0, 0, None
+            return None
+        with _draft_lock(self.dir):
+            return self._load()
+
+    def _load(self):
+        with open(self.snapshot_path, "r") as f:
+            snap = json.load(f)
+        self.gen = snap.get("gen", 0)
+        meta = {k: snap.get(k) for k in ("step", "team_names", "params")}
+        history = snap.get("draft_history", [])
+        self._entries = 0
+        if os.path.exists(self.journal_path):
+            good = 0
+            with open(self.journal_path, "rb") as f:
+                for raw in f:
+                    # Every write ends in a newline, so a last line without one is torn even if it parses.
+                    if not raw.endswith(b"\n"):
+                        break
+                    try:
+                        entry = json.loads(raw)
+                    except ValueError:
+                        break  # torn final write
+                    good += len(raw)
+                    self._entries += 1
+                    if entry["op"] == "pick": history.append(entry["entry"])
+                    elif entry["op"] == "undo":
+                        if history: history.pop()
+                    elif entry["op"] == "meta": meta = {k: entry[k] for k in meta}
+            if good < os.path.getsize(self.journal_path):
+                with open(self.journal_path, "r+b") as f:
+                    f.truncate(good)
+                    os.fsync(f.fileno())
+        for stale in os.listdir(self.dir):
+            if (stale.startswith("journal-") and stale != os.path.basename(self.journal_path)) or stale.endswith(".tmp"):
+                os.remove(os.path.join(self.dir, stale))
+        self._meta, self._history = copy.deepcopy(meta), [dict(d) for d in history]
+        self._seen = self._on_disk()
+        return dict(meta, draft_history=history)
+
+    def sync(self, step, history, team_names, params):
+        """Journal the difference between the persisted state and the given one.
+
+        Raises DraftConflict, writing nothing, if another session has written
+        (or deleted) this draft since this store last loaded or synced it.
+        """
+        os.makedirs(self.dir, exist_ok=True)
+        with _draft_lock(self.dir):
+            if self._on_disk() != self._seen:
+                raise DraftConflict(self.draft_id)
+            if self._seen is None:
+                self._meta = copy.deepcopy({"step": step, "team_names": team_names, "params": params})
+                self._history = [dict(d) for d in history]
+                return self._compact()
+            entries = []
+            meta = {"step": step, "team_names": team_names, "params": params}
+            if meta != self._meta:
+                entries.append(dict(op="meta", **meta))
+                self._meta = copy.deepcopy(meta)
+            # History only changes at the tail (picks, sims and undos), so scan back from the end.
+            k = min(len(self._history), len(history))
+            while k and self._history[k - 1] != history[k - 1]:
+                k -= 1
+            entries += [{"op": "undo"}] * (len(self._history) - k)
+            entries += [{"op": "pick", "entry": d} for d in history[k:]]
+            del self._history[k:]
+            self._history.extend(dict(d) for d in history[k:])
+            if not entries:
+                return
+            with open(self.journal_path, "a") as f:
+                f.write("".join(json.dumps(e) + "\n" for e in entries))
+                f.flush()
+                os.fsync(f.fileno())
+            self._entries += len(entries)
+            self._seen = (self.gen, os.path.getsize(self.journal_path))
+            if self._entries >= max(SNAPSHOT_MIN_ENTRIES, len(self._history)):
+                self._compact()
+
+    def compact(self):
+        """Fold the journal into a new snapshot generation and start an empty journal."""
+        with _draft_lock(self.dir):
+            if self._on_disk() != self._seen:
+                raise DraftConflict(self.draft_id)
+            self._compact()
+
+    def _compact(self):
+        old_journal = self.journal_path
+        snap = dict(self._meta, draft_history=self._history, gen=self.gen + 1)
+        _atomic_write_json(self.snapshot_path, snap)
+        self.gen += 1
+        self._entries = 0
+        if os.path.exists(old_journal):
+            os.remove(old_journal)
+        self._seen = (self.gen, 0)
+
+    def delete(self):
+        with _draft_lock(self.dir):
+            shutil.rmtree(self.dir, ignore_errors=True)
+        self._meta, self._history, self._entries, self.gen, self._seen = None, [], 0, 0, None
+
+
+def load_legacy_state(path=LEGACY_SAVE_FILE):
+    """The old single-file draft_state.json, if one is still around."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def claim_legacy_state(draft_id, path=LEGACY_SAVE_FILE):
+    """Take over the old draft_state.json for one draft: the file is renamed first, so
+    only one session imports it, and removed once read. None if there is none, or if it
+    cannot be read, in which case it is kept as draft_state.json.corrupt."""
+    claimed = f"{path}.{draft_id}"
+    try:
+        os.rename(path, claimed)
+    except OSError:
+        return None
+    try:
+        state = load_legacy_state(claimed)
+    except (OSError, ValueError):
+        with contextlib.suppress(OSError):
+            os.replace(claimed, f"{path}.corrupt")
+        return None
+    os.remove(claimed)
+    return state
@@ -0,0 +1,79 @@
+"""Monte Carlo availability forecasts: how likely each player is to last until my next picks."""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from draft_engine import POSITIONS, SIM_WEIGHTS, BatchDraft, get_current_turn
+
+CHUNK_SIMS = 250
+_EXECUTOR, _EXECUTOR_WORKERS = None, 0
+
+
+def upcoming_picks(my_slot, num_teams, curr_pick, total_picks, count=2):
+    """Pick numbers of my next `count` turns after the pick currently on the clock."""
+    picks, n = [], curr_pick + 1
+    while len(picks) < count and n <= total_picks:
+        if get_current_turn(n, num_teams) == my_slot:
+            picks.append(n)
+        n += 1
+    return picks
+
+
+def _executor(workers):
+    global _EXECUTOR, _EXECUTOR_WORKERS
+    if _EXECUTOR is None or _EXECUTOR_WORKERS != workers:
+        if _EXECUTOR is not None:
+            _EXECUTOR.shutdown(wait=False)
+        # spawn keeps workers clear of the Streamlit server's threads
+        _EXECUTOR = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        _EXECUTOR_WORKERS = workers
+    return _EXECUTOR
+
+
+def _run_chunk(job):
+    """Run `sims` noisy opponent drafts side by side; returns survivor counts per checkpoint."""
+    pool, p, available, counts, teams, checkpoints, weights, rating_sd, cost_sd, sims, seed = job
+    rng = np.random.default_rng(seed)
+    ratings = pool.power[None, :] + rng.normal(0.0, rating_sd, (sims, pool.size))
+    w = BatchDraft.uniform_weights(weights, sims, p['num_teams'])
+    w['cost'] = w['cost'] * np.exp(rng.normal(0.0, cost_sd, (sims, 1, len(POSITIONS))))
+    batch = BatchDraft(pool, p, ratings, w, available, counts)
+    survived = np.zeros((len(checkpoints), pool.size))
+    for step, team in enumerate(teams + [None]):
+        for k, cp in enumerate(checkpoints):
+            if cp == step:
+                survived[k] += batch.avail[:, :pool.size].sum(axis=0)
+        if team is None: break
+        batch.step(team)
+    return survived
+
+
+def forecast_survival(state, p, total_picks, n_sims=5000, horizon=2, rating_sd=5.0, cost_sd=0.25,
+                      workers=None, seed=None, weights=SIM_WEIGHTS):
+    """Probability that each player is still available at my next `horizon` picks.
+
+    Opponents draft with the sim heuristic under noise on Power_Rating and on the
+    positional cost weights; my own intervening turns are skipped. Returns the
+    target pick numbers and a (len(targets), players) array indexed by pool row.
+    """
+    pool, num_teams = state.pool, p['num_teams']
+    targets = upcoming_picks(p['my_slot'], num_teams, state.next_pick, total_picks, horizon)
+    if not targets:
+        return [], np.zeros((0, pool.size))
+    teams, checkpoints = [], []
+    for n in range(state.next_pick, targets[-1] + 1):
+        if n in targets:
+            checkpoints.append(len(teams))
+        elif get_current_turn(n, num_teams) != p['my_slot']:
+            teams.append(get_current_turn(n, num_teams))
+    base = (pool, p, ~state.taken, state.counts, teams, checkpoints, weights, rating_sd, cost_sd)
+    seeds = np.random.SeedSequence(seed).spawn((n_sims + CHUNK_SIMS - 1) // CHUNK_SIMS)
+    jobs = [base + (min(CHUNK_SIMS, n_sims - i * CHUNK_SIMS), s) for i, s in enumerate(seeds)]
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    if workers > 1:
+        results = _executor(workers).map(_run_chunk, jobs)
+    else:
+        results = map(_run_chunk, jobs)
+    return targets, sum(results) / n_sims
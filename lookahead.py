@@ -0,0 +1,103 @@
+"""Lookahead recommender: beam search over my remaining picks for the best fielded total.
+
+Opponents between my turns are predicted with the sim heuristic. Each searched
+state is scored by a greedy rollout to my last pick, memoised on the remaining
+pool plus my positional counts, and the search stops at its time budget.
+Rosters are valued on Proj_Score rather than Avg, so games a player is
+expected to miss (a season-ending injury projects to 0) count against them.
+"""
+import time
+
+import numpy as np
+
+from draft_engine import POSITIONS, SIM_WEIGHTS, DraftSimulator, SimState, fielded_total, get_current_turn
+
+
+class LookaheadPlanner:
+    def __init__(self, pool, p, weights=SIM_WEIGHTS, beam_width=4, branch=6, time_budget=2.0):
+        self.pool, self.p, self.weights = pool, p, weights
+        self.my_slot, self.num_teams = p['my_slot'], p['num_teams']
+        self.beam_width, self.branch, self.time_budget = beam_width, branch, time_budget
+        self.memo = {}
+
+    def _sim(self, state):
+        return DraftSimulator(self.pool, self.p, state, self.weights)
+
+    def _key(self, state):
+        return state.taken.tobytes(), tuple(state.counts[self.my_slot])
+
+    def _rollout(self, state):
+        """Greedy finish (everyone, me included, on the heuristic); returns (my projected fielded total, my picks)."""
+        key = self._key(state)
+        if key not in self.memo:
+            state = state.copy()
+            sim, mine = self._sim(state), []
+            while state.next_pick <= self.last_pick:
+                team = get_current_turn(state.next_pick, self.num_teams)
+                choice = sim.best_pick(team)
+                if choice is None: break
+                row, pos = choice
+                state.append({"pick": state.next_pick, "team": team, "player": self.pool.names[row], "assigned_pos": pos})
+                if team == self.my_slot:
+                    mine.append((row, pos))
+            self.memo[key] = (fielded_total(self.pool, state.rosters.get(self.my_slot, []), self.p, self.pool.proj), mine)
+        return self.memo[key]
+
+    def _candidates(self, state):
+        """My top picks by the heuristic, plus the best projection still open in each position."""
+        scores = self._sim(state).pick_scores(self.my_slot)
+        cands = []
+        for flat in np.argsort(-scores, axis=None, kind='stable'):
+            if not scores.flat[flat] > -9999.0 or len(cands) >= self.branch: break
+            cands.append(tuple(int(x) for x in divmod(int(flat), len(POSITIONS))))
+        for j in range(len(POSITIONS)):
+            legal = np.flatnonzero(np.isfinite(scores[:, j]))
+            if len(legal):
+                cands.append((int(legal[np.argmax(self.pool.proj[legal])]), j))
+        return list(dict.fromkeys(cands))
+
+    def plan(self, state, total_picks, cancelled=None):
+        """Best plan from the current draft state.
+
+        Returns {"plan": [(player, pos), ...] for my next picks, "projected": projected
+        fielded total, "greedy": the same for the plain heuristic, "options": {first
+        player: best projected total}, "depth": picks searched}. Setting the
+        optional `cancelled` event stops the search early, like the time budget.
+        """
+        deadline = time.perf_counter() + self.time_budget
+        stop = lambda: time.perf_counter() >= deadline or (cancelled is not None and cancelled.is_set())
+        mine = [n for n in range(state.next_pick, total_picks + 1) if get_current_turn(n, self.num_teams) == self.my_slot]
+        if not mine:
+            return None
+        self.last_pick = mine[-1]
+        root = SimState.from_draft(state) if not isinstance(state, SimState) else state.copy()
+        self._sim(root).sim_to_slot(self.my_slot, total_picks)
+        greedy, tail = self._rollout(root)
+        best = (greedy, [], tail)
+        options, frontier, depth = {}, [(root, [])], 0
+        while frontier and depth < len(mine) and not stop():
+            children = []
+            for node, path in frontier:
+                for row, j in self._candidates(node):
+                    if stop(): break
+                    child = node.copy()
+                    child.append({"pick": child.next_pick, "team": self.my_slot, "player": self.pool.names[row], "assigned_pos": POSITIONS[j]})
+                    self._sim(child).sim_to_slot(self.my_slot, total_picks)
+                    value, tail = self._rollout(child)
+                    step = path + [(row, POSITIONS[j])]
+                    children.append((value, child, step, tail))
+                    first = self.pool.names[step[0][0]]
+                    options[first] = max(options.get(first, value), value)
+                    if value > best[0]:
+                        best = (value, step, tail)
+            children.sort(key=lambda c: -c[0])
+            frontier = [(c[1], c[2]) for c in children[:self.beam_width]]
+            depth += 1
+        value, path, tail = best
+        return {
+            "plan": [(self.pool.names[r], pos) for r, pos in path + tail],
+            "projected": round(value, 1),
+            "greedy": round(greedy, 1),
+            "options": {name: round(v, 1) for name, v in sorted(options.items(), key=lambda kv: -kv[1])},
+            "depth": depth,
+        }
@@ -0,0 +1,62 @@
+"""Per-rerun stage timings for the war room, with rolling percentiles and an opt-in JSONL log."""
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+PERF_LOG = 'perf_log.jsonl'
+# Reruns kept for the rolling p50 / p95.
+PERF_WINDOW = 200
+
+
+class StageTimer:
+    """Collects named stage durations (ms) for the current rerun and keeps a window of past reruns."""
+
+    def __init__(self, window=PERF_WINDOW):
+        self.history = deque(maxlen=window)
+        self.current, self.meta = {}, {}
+        self.log_path = None
+        self._started = None
+
+    def start_run(self, **meta):
+        # A run cut short by st.rerun() is still recorded (that is where sims and picks happen).
+        if self.current:
+            self.finish_run()
+        self.current, self.meta = {}, meta
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[name] = self.current.get(name, 0.0) + (time.perf_counter() - t0) * 1000
+
+    def finish_run(self):
+        if self._started is not None:
+            self.current['total'] = (time.perf_counter() - self._started) * 1000
+        run, self.current, self._started = self.current, {}, None
+        if not run:
+            return
+        self.history.append(run)
+        if self.log_path:
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps({"ts": round(time.time(), 3), **self.meta, "stages": {k: round(v, 3) for k, v in run.items()}}) + "\n")
+
+    @property
+    def last(self):
+        return self.history[-1] if self.history else {}
+
+    def summary(self):
+        """Last / p50 / p95 ms per stage over the window, in first-seen stage order."""
+        stages = list(dict.fromkeys(k for run in self.history for k in run))
+        rows = []
+        for name in stages:
+            vals = np.array([run[name] for run in self.history if name in run])
+            rows.append({"Stage": name, "Last": self.last.get(name, np.nan), "p50": np.percentile(vals, 50),
+                         "p95": np.percentile(vals, 95), "Runs": len(vals)})
+        return pd.DataFrame(rows, columns=["Stage", "Last", "p50", "p95", "Runs"]).round(2)
@@ -0,0 +1,63 @@
+"""On-disk cache of the enriched player frame, keyed on the source files' contents.
+
+The frame is stored as an uncompressed Arrow IPC file so it can be memory
+mapped: a cold start becomes a cache read, and app workers on one host share
+the same pages instead of each holding a parsed copy.
+"""
+import glob
+import hashlib
+import os
+
+import pyarrow as pa
+
+from player_data import DATA_FILES
+
+CACHE_DIR = '.player_cache'
+# Bump when the enrichment pipeline changes shape so old files are ignored.
+CACHE_VERSION = 2
+
+
+def source_fingerprint(files=DATA_FILES):
+    h = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for key in sorted(files):
+        h.update(key.encode())
+        try:
+            with open(files[key], 'rb') as f:
+                h.update(hashlib.sha256(f.read()).digest())
+        except OSError:
+            h.update(b'missing')
+    return h.hexdigest()[:16]
+
+
+def cache_path(fingerprint, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"players-{fingerprint}.arrow")
+
+
+def read_player_cache(fingerprint, cache_dir=CACHE_DIR):
+    """Memory-mapped frame for this fingerprint, or None on a miss or unreadable file."""
+    path = cache_path(fingerprint, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        # split_blocks keeps the numeric columns as zero-copy views over the map
+        return table.to_pandas(split_blocks=True)
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+
+def write_player_cache(df, fingerprint, cache_dir=CACHE_DIR):
+    """Atomically writes the frame and drops cache files for older fingerprints."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = cache_path(fingerprint, cache_dir)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(tmp, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+    for old in glob.glob(os.path.join(cache_dir, "players-*.arrow")):
+        if old != path:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
@@ -0,0 +1,218 @@
+"""Player data pipeline: CSV parsing, enrichment and Power_Rating scoring.
+
+Everything here works on whole columns. Loading and enrichment are split from
+the rating step so that reweighting only recomputes the rating columns.
+"""
+import re
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+DATA_FILES = {
+    "players": 'supercoach_data.csv',
+    "ratings": 'Draft Doctor SC Ratings.csv',
+    "injuries": '260302 AFL Injury List.csv',
+    "breakouts": '260302 AFL Breakout Players.csv',
+}
+
+RATING_WEIGHTS = {
+    "avg": 0.85,
+    "last3": 0.05,
+    "def_kick_in": 0.2,
+    # (max expert rank, bonus), checked in order
+    "expert_tiers": ((10, 12.0), (25, 8.0), (50, 4.0), (100, 1.5)),
+    "injury_penalties": {"Long": 1000.0, "Mid": 20.0, "Short": 5.0},
+}
+
+# Risk-adjusted mode: Power_Rating with the projected mean swapped for this lower quantile.
+RISK_QUANTILE = 0.2
+
+PROJECTION_WEIGHTS = {
+    "season_games": 23,
+    # Per-game blend of the season Avg, Last5_Avg, the two half-season
+    # averages and a role estimate (PointsPerMinute x minutes on ground).
+    "blend": {"avg": 0.45, "last5": 0.15, "halves": 0.25, "role": 0.15},
+    "late_half": 1.5,  # weight per R13-24 game relative to an R1-12 game
+    "game_minutes": 120.0,
+    # Shrinkage toward a fringe player's average: this quantile of Avg among players with games.
+    "prior_games": 2.0,
+    "prior_quantile": 0.25,
+    "min_sd": 5.0,
+    "cba_sd_cut": 0.25,  # a full-time centre bounce role trims game-to-game sd by up to this
+    # Expected games missed by severity when Injury_Return gives no weeks / round.
+    "injury_games": {"None": 0.0, "Short": 3.0, "Mid": 6.0, "Long": 15.0},
+    "injury_games_sd": 0.5,  # uncertainty of games missed, relative to the nearer of 0 and a full season
+}
+
+NUMERIC_COLS = ['Avg', 'Last3_Avg', 'gamesPlayed', 'KickInAvg', 'CbaAvg', 'Last5_Avg', 'R1_12_Games', 'R1_12_Avg',
+                'R13_24_Games', 'R13_24_Avg', 'PointsPerMinute', 'Tog%', 'HighScore', 'LowScore']
+CATEGORY_COLS = ['club', 'positions', 'playerType', 'Injury_Severity']
+# Source stats carry at most 3 decimals, which float32 storage round-trips at 4.
+STAT_DECIMALS = 4
+
+# Injury classification, checked in order: None (< 2 weeks), Long (season / months),
+# Short (strictly 2-4 weeks), otherwise Mid (TBC, 4-6 weeks, mid / early season).
+INJ_NONE = re.compile(r'healthy|test|1 week|opening round|round zero|rd 1')
+INJ_LONG = re.compile(r'indefinite|months')
+INJ_SEASON = re.compile(r'season')
+INJ_PART_SEASON = re.compile(r'early|mid')
+INJ_WEEK = re.compile(r'week')
+INJ_SHORT_WEEKS = re.compile(r'[234]')
+INJ_LONGER_WEEKS = re.compile(r'[5-9]|10')
+INJ_POST_R2 = re.compile(r'post-round 2')
+# Games-missed parsing for projections
+INJ_ROUND = re.compile(r'round (\d+)')
+INJ_EARLY = re.compile(r'early')
+INJ_MID_SEASON = re.compile(r'mid')
+INJ_LATE = re.compile(r'late')
+
+
+def read_players(path=DATA_FILES["players"]):
+    df = pd.read_csv(path)
+    df.columns = [c.strip() for c in df.columns]
+    if 'full_name' not in df.columns:
+        df['full_name'] = (df['first_name'].astype(str) + ' ' + df['last_name'].astype(str)).str.strip()
+    for col in NUMERIC_COLS:
+        df[col] = pd.to_numeric(df.get(col, 0), errors='coerce').fillna(0)
+    return df
+
+
+def read_expert_ranks(path=DATA_FILES["ratings"]):
+    """Best (lowest) Draft Doctor rank per player across every expert column."""
+    exp_df = pd.read_csv(path).iloc[1:]
+    exp_df = exp_df.assign(Rank=pd.to_numeric(exp_df['Rank'], errors='coerce')).dropna(subset=['Rank'])
+    long = exp_df.melt(id_vars='Rank', value_name='name').dropna(subset=['name'])
+    long['name'] = long['name'].astype(str).str.strip()
+    long = long[(long['name'] != '') & (long['name'].str.lower() != 'nan') & (long['Rank'] < 999)]
+    return long.groupby('name')['Rank'].min()
+
+
+def read_injuries(path=DATA_FILES["injuries"]):
+    inj_df = pd.read_csv(path)
+    ret = pd.Series(inj_df['Estimated Return'].str.strip().to_numpy(), index=inj_df['Player'].str.strip())
+    return ret[~ret.index.duplicated(keep='last')]
+
+
+def read_breakouts(path=DATA_FILES["breakouts"]):
+    return pd.read_csv(path)['Player'].str.strip().tolist()
+
+
+def classify_injuries(returns):
+    r = returns.astype(str).str.lower()
+    week = r.str.contains(INJ_WEEK)
+    return pd.Series(np.select(
+        [
+            r.str.contains(INJ_NONE),
+            r.str.contains(INJ_LONG) | (r.str.contains(INJ_SEASON) & ~r.str.contains(INJ_PART_SEASON)),
+            (week & r.str.contains(INJ_SHORT_WEEKS) & ~r.str.contains(INJ_LONGER_WEEKS)) | r.str.contains(INJ_POST_R2),
+        ],
+        ['None', 'Long', 'Short'], 'Mid'), index=returns.index)
+
+
+def enrich(df, expert_ranks, injuries, breakouts):
+    """Map the expert, injury and breakout lists onto the main player frame."""
+    df = df.copy()
+    df['Expert_Rank'] = df['full_name'].map(expert_ranks).fillna(999)
+    df['Injury_Return'] = df['full_name'].map(injuries).fillna('Healthy')
+    df['Is_Breakout'] = df['full_name'].isin(breakouts)
+    df['Injury_Severity'] = classify_injuries(df['Injury_Return'])
+    return df
+
+
+def games_missed(returns, severity, season_games, by_severity):
+    """Expected games missed from the Injury_Return text, falling back on Injury_Severity."""
+    r = returns.astype(str).str.lower()
+    sev = severity.astype(str)
+    weeks = r.str.extractall(r'(\d+)')[0].astype(float).groupby(level=0).mean().reindex(r.index)
+    back_in = pd.to_numeric(r.str.extract(INJ_ROUND, expand=False), errors='coerce') - 1
+    default = sev.map(by_severity).fillna(by_severity.get('Mid', 0.0)).to_numpy(dtype=float)
+    missed = np.select(
+        [sev == 'None', back_in.notna(), r.str.contains(INJ_WEEK) & weeks.notna(),
+         r.str.contains(INJ_SEASON) & r.str.contains(INJ_LATE), r.str.contains(INJ_SEASON) & r.str.contains(INJ_MID_SEASON),
+         r.str.contains(INJ_SEASON) & r.str.contains(INJ_EARLY), (sev == 'Long') & r.str.contains(INJ_SEASON)],
+        [0.0, back_in, weeks, season_games * 0.75, season_games * 0.5, season_games * 0.2, season_games],
+        default)
+    return np.clip(missed, 0.0, season_games)
+
+
+def project_players(df, weights=PROJECTION_WEIGHTS):
+    """Adds Proj_Avg (per game played), Proj_Games, Proj_Score (per round, missed games counted
+    as zero), Proj_SD (uncertainty of Proj_Score) and Proj_Floor (its RISK_QUANTILE) in one pass."""
+    col = lambda c: df[c].to_numpy(dtype=float)
+    season = float(weights['season_games'])
+    gp, avg = col('gamesPlayed'), col('Avg')
+    g1, g2 = col('R1_12_Games'), col('R13_24_Games') * weights['late_half']
+    halves = np.divide(col('R1_12_Avg') * g1 + col('R13_24_Avg') * g2, g1 + g2, out=avg.copy(), where=(g1 + g2) > 0)
+    last5 = np.where(gp > 0, col('Last5_Avg'), avg)
+    role = col('PointsPerMinute') * weights['game_minutes'] * col('Tog%') / 100
+    role = np.where(role > 0, role, avg)
+    b = weights['blend']
+    per_game = (b['avg'] * avg + b['last5'] * last5 + b['halves'] * halves + b['role'] * role) / sum(b.values())
+    played = avg[gp > 0]
+    prior = float(np.quantile(played, weights['prior_quantile'])) if len(played) else 0.0
+    k = weights['prior_games']
+    mu = (gp * per_game + k * prior) / (gp + k)
+
+    # Game-to-game spread from the High/Low range, tighter for centre bounce regulars.
+    spread = np.where(gp >= 2, (col('HighScore') - col('LowScore')) / 4, 0.3 * np.maximum(mu, 10.0))
+    sd_game = np.maximum(spread, weights['min_sd']) * (1 - weights['cba_sd_cut'] * np.clip(col('CbaAvg') / 100, 0, 1))
+    trend = np.where((col('R1_12_Games') >= 3) & (col('R13_24_Games') >= 3), np.abs(col('R13_24_Avg') - col('R1_12_Avg')) / 2, 0.0)
+    sd_mu = np.sqrt(sd_game ** 2 / (gp + k) + trend ** 2)
+
+    missed = games_missed(df['Injury_Return'], df['Injury_Severity'], season, weights['injury_games'])
+    games = season - missed
+    share = games / season
+    score = mu * share
+    sd_missed = weights['injury_games_sd'] * np.minimum(missed, games)
+    var = share ** 2 * (sd_mu ** 2 + sd_game ** 2 / np.maximum(games, 1)) + (mu * sd_missed / season) ** 2
+    sd = np.sqrt(var)
+    floor = score + NormalDist().inv_cdf(RISK_QUANTILE) * sd
+    return df.assign(Proj_Avg=mu.round(2), Proj_Games=games.round(1), Proj_Score=score.round(2), Proj_SD=sd.round(2),
+                     Proj_Floor=floor.round(2))
+
+
+def as_float64(values):
+    """Upcasts a (possibly float32) stat column to the exact float64 values parsed from the CSV."""
+    return np.round(np.asarray(values, dtype=float), STAT_DECIMALS)
+
+
+def compact_frame(df):
+    """Categoricals for the repeated labels and float32 for every numeric stat."""
+    df = df.copy()
+    for col in CATEGORY_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    num_cols = df.select_dtypes('number').columns
+    df[num_cols] = df[num_cols].astype('float32')
+    return df
+
+
+def apply_ratings(df, weights=RATING_WEIGHTS):
+    """Adds Power_Rating and Risk_Profile to an enriched frame using the given weights."""
+    score = (as_float64(df['Avg']) * weights['avg']) + (as_float64(df['Last3_Avg']) * weights['last3'])
+    score = score + np.where(df['positions'].str.contains('DEF', na=False), as_float64(df['KickInAvg']) * weights['def_kick_in'], 0.0)
+    exp_rank = df['Expert_Rank']
+    tiers = list(weights['expert_tiers'])
+    score = score + np.select([exp_rank <= cap for cap, _ in tiers], [bonus for _, bonus in tiers], 0.0)
+    penalties = weights['injury_penalties']
+    inj = df['Injury_Severity']
+    score = score - np.select([inj == k for k in penalties], list(penalties.values()), 0.0)
+    gp = df['gamesPlayed']
+    risk = np.select([gp >= 18, gp >= 12], ["🟢 Low", "🟡 Mod"], "🔴 High")
+    # Python's round rather than np.round, which drifts by 0.1 on some halves.
+    # assign() leaves the (possibly memory-mapped) source columns shared.
+    rating = [round(x, 1) for x in score.tolist()]
+    out = df.assign(Power_Rating=rating, Risk_Profile=pd.Categorical(risk, categories=["🟢 Low", "🟡 Mod", "🔴 High"]))
+    if 'Proj_SD' in df.columns:
+        # Lower-quantile twin of Power_Rating, in the same units as its Avg term.
+        z = -NormalDist().inv_cdf(RISK_QUANTILE)
+        out = out.assign(Risk_Rating=np.round(np.array(rating) - weights['avg'] * z * as_float64(df['Proj_SD']), 1))
+    return out
+
+
+def load_players(files=DATA_FILES, weights=RATING_WEIGHTS):
+    """Read, enrich and rate the player frame in one go, as the app does but without the UI or caches."""
+    df = enrich(read_players(files["players"]), read_expert_ranks(files["ratings"]),
+                read_injuries(files["injuries"]), read_breakouts(files["breakouts"]))
+    return apply_ratings(compact_frame(project_players(df)), weights)
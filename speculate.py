@@ -0,0 +1,136 @@
+"""Speculative precompute of my next turn while opponents are on the clock.
+
+From the live draft state the likeliest opponent-pick branches up to my turn
+are enumerated with a beam search (the heuristic's top candidates per pick,
+weighted by a softmax over their scores), and a lookahead plan is computed for
+each branch on a background thread. When my turn arrives, the branch matching
+what actually happened is served from cache; branches the real picks have
+ruled out are dropped before they are computed.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from draft_engine import POSITIONS, SIM_WEIGHTS, DraftSimulator, SimState, get_current_turn
+from lookahead import LookaheadPlanner
+
+# Candidates considered per opponent pick, branches planned per speculation,
+# the score scale of the softmax that ranks candidates, and the seconds the
+# branch enumeration may take before it gives up.
+SPEC_BRANCH = 3
+SPEC_MAX_BRANCHES = 8
+SPEC_TEMPERATURE = 5.0
+SPEC_TIME_BUDGET = 5.0
+
+
+def state_key(state):
+    """What my recommendations depend on: who is gone and every team's positional counts."""
+    return state.taken.tobytes(), state.counts.tobytes()
+
+
+def likely_branches(pool, p, root, total_picks, branch=SPEC_BRANCH, max_branches=SPEC_MAX_BRANCHES,
+                    temperature=SPEC_TEMPERATURE, weights=SIM_WEIGHTS, cancelled=None, time_budget=SPEC_TIME_BUDGET):
+    """Up to max_branches (probability, picks, state at my turn), most likely first.
+
+    A beam search: every partial path is extended by one opponent pick at a
+    time and only the max_branches likeliest are kept, so the work grows with
+    the picks until my turn rather than exponentially. Cancelling or running
+    past time_budget returns no branches.
+    """
+    deadline = time.perf_counter() + time_budget
+    beam = [(0.0, [], root)]
+    while True:
+        if (cancelled is not None and cancelled.is_set()) or time.perf_counter() >= deadline:
+            return []
+        state = beam[0][2]
+        # Snake order is the same on every path, so the whole beam reaches my turn together.
+        team = get_current_turn(state.next_pick, p['num_teams'])
+        if team == p['my_slot'] or state.next_pick > total_picks:
+            break
+        options = []
+        for k, (logp, _, state) in enumerate(beam):
+            scores = DraftSimulator(pool, p, state, weights).pick_scores(team)
+            flat = np.argsort(-scores, axis=None, kind='stable')[:branch]
+            flat = flat[np.isfinite(scores.flat[flat])]
+            if not len(flat):
+                continue  # a stalled draft; the sim stops here too
+            top = scores.flat[flat]
+            lps = (top - top[0]) / temperature
+            lps -= np.log(np.exp(lps).sum())
+            options += [(logp + lp, k, int(f)) for f, lp in zip(flat, lps)]
+        if not options:
+            return []
+        options.sort(key=lambda o: -o[0])
+        children = []
+        for logp, k, f in options[:max_branches]:
+            path, child = beam[k][1], beam[k][2].copy()
+            row, j = divmod(f, len(POSITIONS))
+            pick = {"pick": child.next_pick, "team": team, "player": pool.names[row], "assigned_pos": POSITIONS[j]}
+            child.append(pick)
+            children.append((logp, path + [(pick['player'], pick['assigned_pos'])], child))
+        beam = children
+    return [(float(np.exp(logp)), path, state) for logp, path, state in beam]
+
+
+class Speculator:
+    """Session-owned background worker running one speculation (from one root state) at a time."""
+
+    def __init__(self, pool, p, weights=SIM_WEIGHTS):
+        self.pool, self.p, self.weights = pool, p, weights
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculate")
+        self.lock = threading.Lock()
+        self.cancelled = threading.Event()
+        self.root_len, self.actual = None, []
+        self.paths, self.results, self.listed = {}, {}, False
+
+    def _viable(self, path):
+        # Called under the lock: the real picks since the root must be a prefix of the branch.
+        return len(self.actual) <= len(path) and path[:len(self.actual)] == self.actual
+
+    def _run(self, root, total_picks, cancelled):
+        leaves = likely_branches(self.pool, self.p, root, total_picks, weights=self.weights, cancelled=cancelled)
+        with self.lock:
+            if cancelled.is_set(): return
+            for _, path, leaf in leaves:
+                self.paths.setdefault(state_key(leaf), path)
+            self.listed = True
+        for _, path, leaf in leaves:
+            key = state_key(leaf)
+            with self.lock:
+                if cancelled.is_set(): return
+                if key in self.results or not self._viable(path): continue
+            plan = LookaheadPlanner(self.pool, self.p, self.weights).plan(leaf, total_picks, cancelled)
+            with self.lock:
+                if cancelled.is_set(): return
+                self.results[key] = plan
+
+    def update(self, state, total_picks):
+        """Call on every rerun. Records the real picks since the root, which rules out
+        stale branches, and starts a new speculation once none of them can still happen."""
+        if get_current_turn(state.next_pick, self.p['num_teams']) == self.p['my_slot'] or state.next_pick > total_picks:
+            return  # my turn: leave the cache for result()
+        if self.root_len is not None and len(state.history) >= self.root_len:
+            with self.lock:
+                self.actual = [(d['player'], d['assigned_pos']) for d in state.history[self.root_len:]]
+                if not self.listed or any(self._viable(path) for path in self.paths.values()):
+                    return
+        self.start(state, total_picks)
+
+    def start(self, state, total_picks):
+        self.cancelled.set()
+        with self.lock:
+            self.cancelled = threading.Event()
+            self.root_len, self.actual = len(state.history), []
+            self.paths, self.results, self.listed = {}, {}, False
+        self.executor.submit(self._run, SimState.from_draft(state), total_picks, self.cancelled)
+
+    def result(self, state):
+        """Precomputed lookahead plan if a speculated branch matches the current state, else None."""
+        with self.lock:
+            return self.results.get(state_key(state))
+
+    def shutdown(self):
+        self.cancelled.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,99 @@
+"""League standings kept current pick by pick, with best fielded lineups over multi-position eligibility.
+
+A dual-position player (e.g. DEF/MID) can fill whichever field slot gives
+the team the best total, so the lineup is an assignment problem: field
+slots x rostered players, solved with the Hungarian algorithm below.
+"""
+import numpy as np
+
+from draft_engine import POSITIONS, team_standing
+
+
+def hungarian(cost):
+    """Minimum-cost assignment of each row of an (n, m) cost matrix (n <= m) to a distinct column.
+
+    Kuhn-Munkres with row / column potentials, O(n^2 m); the inner column scan
+    is vectorised. Returns the column chosen for each row.
+    """
+    n, m = cost.shape
+    u, v = np.zeros(n + 1), np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=int)  # row (1-based) holding each column, 0 when free; column 0 is a sentinel
+    way = np.zeros(m + 1, dtype=int)
+    for i in range(1, n + 1):
+        match[0], j0 = i, 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            free = ~used
+            free[0] = False
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free[1:] & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            cand = np.where(free, minv, np.inf)
+            j1 = int(np.argmin(cand))
+            delta = cand[j1]
+            u[match[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+    cols = np.full(n, -1)
+    rows = np.flatnonzero(match[1:])
+    cols[match[1:][rows] - 1] = rows
+    return cols
+
+
+def best_lineup(values, elig, slots):
+    """Highest total of `values` over the field: slots[j] spots at POSITIONS[j], each
+    taken by a different player eligible there. Returns (total, [(player, position index)])."""
+    slot_pos = np.repeat(np.arange(len(POSITIONS)), slots)
+    n, k = len(slot_pos), len(values)
+    if not n or not k:
+        return 0.0, []
+    gain = np.where(elig[:, slot_pos].T, np.asarray(values, dtype=float)[None, :], 0.0)
+    # n zero-cost columns let any slot stay empty when nobody eligible is left.
+    cols = hungarian(np.hstack([-gain, np.zeros((n, n))]))
+    lineup = [(int(c), int(slot_pos[s])) for s, c in enumerate(cols) if c < k and gain[s, c] > 0]
+    return float(sum(values[c] for c, _ in lineup)), lineup
+
+
+class Standings:
+    """Per-team totals and lineups for one DraftState, recomputed only for teams whose picks changed."""
+
+    def __init__(self, pool, p):
+        self.pool, self.p = pool, p
+        self.slots = np.array([p.get(pos, 0) for pos in POSITIONS])
+        self.state, self.versions, self.teams = None, None, {}
+
+    def _score(self, team):
+        pool = self.pool
+        rows = [pool.row_for(d['player']) for d in self.state.team_picks.get(team, [])]
+        rows = np.array([r for r in rows if r is not None], dtype=int)
+        best, lineup = best_lineup(pool.avg[rows], pool.elig[rows], self.slots)
+        projected, _ = best_lineup(pool.proj[rows], pool.elig[rows], self.slots)
+        row = team_standing(self.state, self.p, team)
+        row.update(picks=len(self.state.team_picks.get(team, [])), best=best, projected=projected,
+                   lineup=[(pool.names[rows[c]], POSITIONS[j]) for c, j in lineup])
+        self.teams[team] = row
+
+    def sync(self, state):
+        if state is not self.state:
+            self.state, self.teams = state, {}
+            self.versions = np.full(state.num_teams + 1, -1, dtype=np.int64)
+        for team in np.flatnonzero(state.team_versions != self.versions):
+            if team:
+                self._score(int(team))
+        self.versions = state.team_versions.copy()
+
+    def table(self, state):
+        """One row per team (team order): fielded / whole as drafted, best lineup, projected lineup."""
+        self.sync(state)
+        return [self.teams[t] for t in range(1, state.num_teams + 1)]
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from draft_engine import PlayerPool  # noqa: E402
+from player_data import DATA_FILES, load_players  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def players():
+    return load_players({key: os.path.join(ROOT, name) for key, name in DATA_FILES.items()})
+
+
+@pytest.fixture(scope="session")
+def pool(players):
+    return PlayerPool(players)
+
+
+@pytest.fixture
+def league():
+    """A small league, so the pandas reference loops stay quick."""
+    return {"num_teams": 6, "my_slot": 2, "DEF": 2, "MID": 3, "RUC": 1, "FWD": 2, "bench_size": 3}
@@ -0,0 +1,76 @@
+import pytest
+
+from bulk_picks import NameMatcher, parse_picks, parse_positions, plan_picks
+from draft_engine import DraftState
+
+
+def entry(player, position="", team="", line=1):
+    return {"line": line, "player": player, "position": position, "team": team}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Nick Daicos, MID", [entry("Nick Daicos", "MID")]),
+    ("Nick Daicos\tMID", [entry("Nick Daicos", "MID")]),
+    ("Nick Daicos; MID", [entry("Nick Daicos", "MID")]),
+    ("Nick Daicos | MID", [entry("Nick Daicos", "MID")]),
+    ("12, Nick Daicos, MID", [entry("Nick Daicos", "MID")]),
+    ("Nick Daicos MID", [entry("Nick Daicos", "MID")]),
+    ("Noah Balta DEF/FWD", [entry("Noah Balta", "DEF/FWD")]),
+    ("Nick Daicos", [entry("Nick Daicos")]),
+    ("Nick Daicos, MID\n\n  \nMax Gawn, RUC", [entry("Nick Daicos", "MID"), entry("Max Gawn", "RUC", line=2)]),
+    ("Pick,Player,Position,Team\n1,Nick Daicos,MID,Team 1", [entry("Nick Daicos", "MID", "Team 1", line=2)]),
+    ("Pick,Player,Position\n1,Noah Balta,DEF/FWD", [entry("Noah Balta", "DEF/FWD", line=2)]),
+    ("Name;Coach\nMax Gawn;Team 1", [entry("Max Gawn", team="Team 1", line=2)]),
+    ("Slot,Player\n3,Max Gawn", [entry("Max Gawn", line=2)]),
+    ("", []),
+])
+def test_parse_picks_formats(text, expected):
+    assert parse_picks(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("MID", ["MID"]), ("mids", ["MID"]), ("Ruck", ["RUC"]), ("D", ["DEF"]),
+    ("DEF/MID", ["DEF", "MID"]), ("FWD / DEF", ["FWD", "DEF"]), ("DEF/Bench", None), ("Slot 3", None),
+])
+def test_parse_positions(text, expected):
+    assert parse_positions(text) == expected
+
+
+@pytest.fixture
+def plan(pool, league):
+    def run(entries, history=()):
+        state = DraftState(pool, league['num_teams'], list(history))
+        return plan_picks(entries, state, league, NameMatcher(pool), {"3": "Crows"})
+    return run
+
+
+@pytest.mark.parametrize("entries, statuses, positions", [
+    ([entry("Nick Daicos", "MID"), entry("max gawn")], ["ok", "ok"], ["MID", "RUC"]),
+    ([entry("Noah Balta", "DEF/FWD")], ["ok"], ["DEF"]),
+    ([entry("Noah Balta", "FWD/MID")], ["ok"], ["FWD"]),
+    ([entry("Nick Daicoss")], ["ok (fuzzy match)"], ["MID"]),
+    ([entry("N. Daicos")], ["ok (fuzzy match)"], ["MID"]),
+    ([entry("Nick Daicos", "RUC")], ["not eligible at RUC (MID)"], [""]),
+    ([entry("Nick Daicos", "Bench")], ["unknown position 'Bench'"], [""]),
+    ([entry("Nick Daicos"), entry("Nick Daicos"), entry("Max Gawn")], ["ok", "already drafted", "skipped"], ["MID", "", ""]),
+    ([entry("Nobody Atall"), entry("Max Gawn")], ["no matching player", "skipped"], ["", ""]),
+    ([entry("Max Gawn", team="1"), entry("Nick Daicos", team="Crows")],
+     ["ok", "out of snake order (pick 2 belongs to Team 2)"], ["RUC", ""]),
+    ([entry("Max Gawn", team="1"), entry("Nick Daicos", team="2"), entry("Jordan Dawson", team="crows")],
+     ["ok", "ok", "ok"], ["RUC", "MID", "MID"]),
+])
+def test_plan_picks_stops_at_first_problem(plan, entries, statuses, positions):
+    picks, report = plan(entries)
+    assert [row["Status"] for row in report] == statuses
+    assert [row["Pos"] for row in report] == positions
+    ok = [row for row in report if row["Status"].startswith("ok")]
+    assert [(d["player"], d["assigned_pos"], d["pick"]) for d in picks] == [(row["Player"], row["Pos"], row["Pick"]) for row in ok]
+
+
+def test_plan_picks_checks_roster_room(plan, league):
+    # Team 1 already holds its single RUC; its next pick (13 in a 6-team snake) cannot be another.
+    history = [{"pick": n, "team": t, "player": f"Filler {n}", "assigned_pos": "MID"} for n, t in
+               zip(range(1, 13), [1, 2, 3, 4, 5, 6, 6, 5, 4, 3, 2, 1])]
+    history[0]["assigned_pos"] = "RUC"
+    picks, report = plan([entry("Max Gawn")], history)
+    assert not picks and report[0]["Status"] == "roster full at RUC"
@@ -0,0 +1,124 @@
+"""The array engine against the pandas loops it replaced in app.py."""
+import numpy as np
+
+from draft_engine import (POSITIONS, SIM_WEIGHTS, BatchDraft, DraftSimulator, DraftState, Recommender,
+                          auto_draft, get_current_turn, total_picks)
+
+
+def legacy_check_roster_limit(chosen_pos, team_id, p, history):
+    count = sum(1 for d in history if d['team'] == team_id and d.get('assigned_pos') == chosen_pos)
+    if chosen_pos == "RUC":
+        return count < p.get('RUC', 1)
+    return count < (p.get(chosen_pos, 0) + (p.get('bench_size', 5) // 2 + 1))
+
+
+def legacy_costs(avail, p):
+    costs = {pos: 0 for pos in POSITIONS}
+    for pos in costs:
+        pool = avail[avail['positions'].str.contains(pos, na=False)].sort_values('Power_Rating', ascending=False)
+        if len(pool) > (p['num_teams'] + 2):
+            costs[pos] = pool.iloc[0]['Power_Rating'] - pool.iloc[p['num_teams'] + 2]['Power_Rating']
+    return costs
+
+
+def legacy_sim_to_slot(df, p, history, total):
+    """The old "Sim to My Turn" iterrows loop."""
+    while len(history) < total:
+        cp = len(history) + 1
+        tn = get_current_turn(cp, p['num_teams'])
+        if tn == p['my_slot']: break
+        av_sim = df[~df['full_name'].isin([d['player'] for d in history])].copy()
+        if av_sim.empty: break
+        costs = legacy_costs(av_sim, p)
+        sim_counts = {pos: sum(1 for d in history if d['team'] == tn and d['assigned_pos'] == pos) for pos in POSITIONS}
+        best_player, best_pos, best_score = None, None, -9999.0
+        for _, r in av_sim.iterrows():
+            for po in r['positions'].split('/'):
+                if legacy_check_roster_limit(po, tn, p, history):
+                    score = r['Power_Rating'] + (costs.get(po, 0) * 0.4)
+                    if sim_counts.get(po, 0) < p.get(po, 0):
+                        score += 5.0
+                    else:
+                        score -= 25.0
+                        if r['Is_Breakout']: score += 40.0
+                    if score > best_score:
+                        best_score, best_player, best_pos = score, r['full_name'], po
+        if not best_player: break
+        history.append({"pick": cp, "team": tn, "player": best_player, "assigned_pos": best_pos})
+
+
+def legacy_opt_scores(df, p, history, team):
+    """The old Opt_Score apply over the available players."""
+    avail = df[~df['full_name'].isin([d['player'] for d in history])].copy()
+    counts = {pos: sum(1 for d in history if d['team'] == team and d['assigned_pos'] == pos) for pos in POSITIONS}
+    costs = legacy_costs(avail, p)
+    return avail.apply(lambda row: max([
+        row['Power_Rating'] + (costs.get(x, 0) * 0.4) +
+        (5.0 if counts.get(x, 0) < p.get(x, 0) else (-25.0 + (40.0 if row['Is_Breakout'] else 0.0)))
+        for x in row['positions'].split('/')
+        if legacy_check_roster_limit(x, team, p, history)
+    ] + [-999]), axis=1).to_numpy()
+
+
+def test_simulator_matches_legacy_loop(players, pool, league):
+    total = total_picks(league)
+    expected, history = [], []
+    state = DraftState(pool, league['num_teams'], history)
+    sim = DraftSimulator(pool, league, state)
+    # Sim to my turn, make my pick as the sim would, and repeat for a few rounds.
+    for _ in range(4):
+        legacy_sim_to_slot(players, league, expected, total)
+        sim.sim_to_slot(league['my_slot'], total)
+        assert history == expected
+        row, pos = sim.best_pick(league['my_slot'])
+        pick = {"pick": state.next_pick, "team": league['my_slot'], "player": pool.names[row], "assigned_pos": pos}
+        expected.append(dict(pick))
+        state.append(pick)
+
+
+def test_batch_draft_matches_simulator(pool, league):
+    state = auto_draft(pool, league)
+    drafts = 3
+    batch = BatchDraft(pool, league, np.repeat(pool.power[None, :], drafts, axis=0),
+                       BatchDraft.uniform_weights(SIM_WEIGHTS, drafts, league['num_teams']))
+    for d in state.history:
+        rows, pos, valid = batch.step(d['team'])
+        assert valid.all()
+        assert [pool.names[r] for r in rows] == [d['player']] * drafts
+        assert [POSITIONS[j] for j in pos] == [d['assigned_pos']] * drafts
+
+
+def test_recommender_matches_legacy_apply(players, pool, league):
+    history = []
+    state = DraftState(pool, league['num_teams'], history)
+    sim, rec = DraftSimulator(pool, league, state), Recommender(pool, league)
+
+    def check(team):
+        scores = rec.opt_scores(state, team)[state.available]
+        np.testing.assert_allclose(scores, legacy_opt_scores(players, league, history, team))
+        np.testing.assert_array_equal(scores, Recommender(pool, league).opt_scores(state, team)[state.available])
+
+    for n in range(1, 25):
+        team = get_current_turn(n, league['num_teams'])
+        check(team)
+        row, pos = sim.best_pick(team)
+        state.append({"pick": n, "team": team, "player": pool.names[row], "assigned_pos": pos})
+    for _ in range(5):
+        state.pop()
+        check(get_current_turn(state.next_pick, league['num_teams']))
+
+
+def test_recommender_rekeys_on_repick_at_another_position(pool, league):
+    # Picks 6 and 7 both belong to team 6 in a 6-team snake; one DEF spot makes the choice matter.
+    league = dict(league, DEF=1)
+    history = []
+    state = DraftState(pool, league['num_teams'], history)
+    sim, rec = DraftSimulator(pool, league, state), Recommender(pool, league)
+    for n in range(1, 6):
+        row, pos = sim.best_pick(get_current_turn(n, league['num_teams']))
+        state.append({"pick": n, "team": get_current_turn(n, league['num_teams']), "player": pool.names[row], "assigned_pos": pos})
+    dual = next(r for r in np.flatnonzero(pool.elig[:, 0] & pool.elig[:, 1]) if not state.taken[r])
+    for pos in ("DEF", "MID"):
+        if pos == "MID": state.pop()
+        state.append({"pick": 6, "team": 6, "player": pool.names[dual], "assigned_pos": pos})
+        np.testing.assert_array_equal(rec.opt_scores(state, 6), Recommender(pool, league).opt_scores(state, 6))
@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+import draft_store
+from draft_store import DraftConflict, DraftStore, claim_legacy_state, saved_drafts
+
+
+def pick(n, player):
+    return {"pick": n, "team": 1, "player": player, "assigned_pos": "MID"}
+
+
+TEAMS, PARAMS = {"1": "Team 1"}, {"num_teams": 2}
+
+
+def test_replays_picks_undos_and_meta_across_compactions(tmp_path, monkeypatch):
+    monkeypatch.setattr(draft_store, "SNAPSHOT_MIN_ENTRIES", 3)
+    store = DraftStore("replay", root=tmp_path)
+    history = []
+    store.sync("draft", history, TEAMS, PARAMS)
+    for n in range(1, 8):
+        history.append(pick(n, f"P{n}"))
+        store.sync("draft", history, TEAMS, PARAMS)
+        if n % 3 == 0:
+            history.pop()
+            store.sync("draft", history, TEAMS, PARAMS)
+    store.sync("draft", history, {"1": "Renamed"}, PARAMS)
+    loaded = DraftStore("replay", root=tmp_path).load()
+    assert loaded["draft_history"] == history
+    assert loaded["team_names"] == {"1": "Renamed"}
+    assert store.gen > 1
+    assert [f for f in os.listdir(store.dir) if f.startswith("journal-")] == [os.path.basename(store.journal_path)]
+
+
+def test_torn_journal_write_is_dropped_and_truncated(tmp_path):
+    store = DraftStore("torn", root=tmp_path)
+    history = [pick(1, "A")]
+    store.sync("draft", history, TEAMS, PARAMS)
+    history.append(pick(2, "B"))
+    store.sync("draft", history, TEAMS, PARAMS)
+    size = os.path.getsize(store.journal_path)
+    with open(store.journal_path, "a") as f:
+        f.write('{"op": "pick", "entry": {"pi')
+    reopened = DraftStore("torn", root=tmp_path)
+    assert reopened.load()["draft_history"] == history
+    assert os.path.getsize(reopened.journal_path) == size
+    history.append(pick(3, "C"))
+    reopened.sync("draft", history, TEAMS, PARAMS)
+    assert DraftStore("torn", root=tmp_path).load()["draft_history"] == history
+
+
+def test_final_line_missing_its_newline_is_torn(tmp_path):
+    store = DraftStore("newline", root=tmp_path)
+    store.sync("draft", [pick(1, "A")], TEAMS, PARAMS)
+    store.sync("draft", [pick(1, "A"), pick(2, "B")], TEAMS, PARAMS)
+    with open(store.journal_path, "r+b") as f:
+        f.truncate(os.path.getsize(store.journal_path) - 1)
+    reopened = DraftStore("newline", root=tmp_path)
+    history = reopened.load()["draft_history"]
+    assert history == [pick(1, "A")]
+    history += [pick(2, "C"), pick(3, "D")]
+    reopened.sync("draft", history, TEAMS, PARAMS)
+    assert DraftStore("newline", root=tmp_path).load()["draft_history"] == history
+
+
+def test_second_session_cannot_interleave_its_picks(tmp_path):
+    a, b = DraftStore("shared", root=tmp_path), DraftStore("shared", root=tmp_path)
+    a.sync("draft", [], TEAMS, PARAMS)
+    b.load()
+    a.sync("draft", [pick(1, "X")], TEAMS, PARAMS)
+    with pytest.raises(DraftConflict):
+        b.sync("draft", [pick(1, "Y")], TEAMS, PARAMS)
+    assert b.load()["draft_history"] == [pick(1, "X")]
+    b.sync("draft", [pick(1, "X"), pick(2, "Y")], TEAMS, PARAMS)
+    with pytest.raises(DraftConflict):
+        a.compact()
+    assert DraftStore("shared", root=tmp_path).load()["draft_history"] == [pick(1, "X"), pick(2, "Y")]
+
+
+def test_deleted_draft_conflicts_with_open_sessions(tmp_path):
+    a, b = DraftStore("gone", root=tmp_path), DraftStore("gone", root=tmp_path)
+    a.sync("draft", [pick(1, "X")], TEAMS, PARAMS)
+    b.load()
+    a.delete()
+    with pytest.raises(DraftConflict):
+        b.sync("draft", [pick(1, "X"), pick(2, "Y")], TEAMS, PARAMS)
+    assert b.load() is None
+
+
+def test_saved_drafts_newest_first(tmp_path):
+    for name, stamp in (("old", 1000), ("new", 2000)):
+        store = DraftStore(name, root=tmp_path)
+        store.sync("draft", [], TEAMS, PARAMS)
+        for entry in os.listdir(store.dir):
+            os.utime(os.path.join(store.dir, entry), (stamp, stamp))
+    os.makedirs(tmp_path / "empty")
+    assert saved_drafts(tmp_path) == ["new", "old"]
+    assert saved_drafts(tmp_path / "missing") == []
+
+
+def test_legacy_state_is_claimed_once(tmp_path):
+    legacy = tmp_path / "draft_state.json"
+    legacy.write_text('{"step": "draft", "draft_history": []}')
+    assert claim_legacy_state("a", legacy)["step"] == "draft"
+    assert claim_legacy_state("b", legacy) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_corrupt_legacy_state_is_set_aside(tmp_path):
+    legacy = tmp_path / "draft_state.json"
+    legacy.write_text('{"step": "dra')
+    assert claim_legacy_state("a", legacy) is None
+    assert os.listdir(tmp_path) == ["draft_state.json.corrupt"]
@@ -0,0 +1,13 @@
+import pytest
+
+from draft_engine import DraftState, total_picks
+from lookahead import LookaheadPlanner
+
+
+@pytest.mark.parametrize("num_teams", [10, 14, 18])
+def test_plan_skips_players_out_for_the_season(players, pool, num_teams):
+    p = {"num_teams": num_teams, "my_slot": num_teams, "DEF": 4, "MID": 5, "RUC": 1, "FWD": 4, "bench_size": 5}
+    out = set(players.loc[players['Injury_Severity'] == 'Long', 'full_name'])
+    plan = LookaheadPlanner(pool, p, time_budget=0.5).plan(DraftState(pool, num_teams, []), total_picks(p))
+    assert out and not out & {name for name, _ in plan['plan']}
+    assert plan['projected'] >= plan['greedy']
@@ -0,0 +1,96 @@
+"""The vectorised rating pipeline against the row-wise load_data it replaced in app.py."""
+import os
+
+import numpy as np
+import pandas as pd
+
+from player_data import DATA_FILES, classify_injuries, read_expert_ranks
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def path(key):
+    return os.path.join(ROOT, DATA_FILES[key])
+
+
+def legacy_expert_scores():
+    expert_scores = {}
+    exp_df = pd.read_csv(path("ratings"))
+    data_rows = exp_df.iloc[1:].copy()
+    data_rows['Rank'] = pd.to_numeric(data_rows['Rank'], errors='coerce')
+    for _, r in data_rows.iterrows():
+        rank = r['Rank']
+        if pd.isna(rank): continue
+        for col in data_rows.columns:
+            if col == 'Rank': continue
+            name = str(r[col]).strip()
+            if name and name.lower() != 'nan':
+                if rank < expert_scores.get(name, 999):
+                    expert_scores[name] = rank
+    return expert_scores
+
+
+def legacy_injury_severity(ret):
+    r = str(ret).lower()
+    if any(x in r for x in ['healthy', 'test', '1 week', 'opening round', 'round zero', 'rd 1']):
+        return 'None'
+    if 'indefinite' in r or 'months' in r or ('season' in r and not any(x in r for x in ['early', 'mid'])):
+        return 'Long'
+    if 'week' in r and any(c in r for c in ['2', '3', '4']) and not any(c in r for c in ['5', '6', '7', '8', '9', '10']):
+        return 'Short'
+    if 'post-round 2' in r:
+        return 'Short'
+    return 'Mid'
+
+
+def legacy_power(row):
+    score = (row['Avg'] * 0.85) + (row['Last3_Avg'] * 0.05)
+    if 'DEF' in row['positions']: score += (row['KickInAvg'] * 0.2)
+    exp_rank = row['Expert_Rank']
+    if exp_rank <= 10: score += 12.0
+    elif exp_rank <= 25: score += 8.0
+    elif exp_rank <= 50: score += 4.0
+    elif exp_rank <= 100: score += 1.5
+    inj = row['Injury_Severity']
+    if inj == 'Long': score -= 1000.0
+    elif inj == 'Mid': score -= 20.0
+    elif inj == 'Short': score -= 5.0
+    return round(score, 1)
+
+
+def legacy_load_data():
+    df = pd.read_csv(path("players"))
+    df.columns = [c.strip() for c in df.columns]
+    if 'full_name' not in df.columns:
+        df['full_name'] = (df['first_name'].astype(str) + ' ' + df['last_name'].astype(str)).str.strip()
+    for col in ['Avg', 'Last3_Avg', 'gamesPlayed', 'KickInAvg', 'CbaAvg']:
+        df[col] = pd.to_numeric(df.get(col, 0), errors='coerce').fillna(0)
+    inj_df = pd.read_csv(path("injuries"))
+    inj_dict = dict(zip(inj_df['Player'].str.strip(), inj_df['Estimated Return'].str.strip()))
+    df['Expert_Rank'] = df['full_name'].map(legacy_expert_scores()).fillna(999)
+    df['Injury_Return'] = df['full_name'].map(inj_dict).fillna('Healthy')
+    df['Injury_Severity'] = df['Injury_Return'].apply(legacy_injury_severity)
+    df['Power_Rating'] = df.apply(legacy_power, axis=1)
+    df['Risk_Profile'] = df['gamesPlayed'].apply(lambda x: "🟢 Low" if x >= 18 else ("🟡 Mod" if x >= 12 else "🔴 High"))
+    return df
+
+
+def test_ratings_match_row_wise_pipeline(players):
+    legacy = legacy_load_data()
+    assert len(players) == len(legacy)
+    assert players['full_name'].tolist() == legacy['full_name'].tolist()
+    np.testing.assert_array_equal(players['Power_Rating'].to_numpy(dtype=float), legacy['Power_Rating'].to_numpy(dtype=float))
+    np.testing.assert_array_equal(players['Expert_Rank'].to_numpy(dtype=float), legacy['Expert_Rank'].to_numpy(dtype=float))
+    assert players['Injury_Severity'].astype(str).tolist() == legacy['Injury_Severity'].tolist()
+    assert players['Risk_Profile'].astype(str).tolist() == legacy['Risk_Profile'].tolist()
+
+
+def test_expert_ranks_match_row_wise_scan():
+    assert read_expert_ranks(path("ratings")).to_dict() == legacy_expert_scores()
+
+
+def test_injury_classes_match_row_wise_parser():
+    returns = pd.Series(["Healthy", "Test", "1 week", "2 weeks", "2-3 weeks", "3-5 weeks", "4-6 weeks", "10 weeks",
+                         "Season", "Early season", "Mid-season", "Indefinite", "2 months", "TBC", "Post-Round 2",
+                         "Round 3", "Opening Round", None])
+    assert classify_injuries(returns).tolist() == [legacy_injury_severity(r) for r in returns]
@@ -0,0 +1,34 @@
+import threading
+import time
+
+import pytest
+
+from draft_engine import DraftSimulator, DraftState, SimState, total_picks
+from speculate import SPEC_MAX_BRANCHES, likely_branches
+
+
+@pytest.mark.parametrize("my_slot, opponent_picks", [(1, 34), (18, 17)])
+def test_eighteen_team_speculation_is_bounded(pool, my_slot, opponent_picks):
+    p = {"num_teams": 18, "my_slot": my_slot, "DEF": 4, "MID": 5, "RUC": 1, "FWD": 4, "bench_size": 5}
+    state = DraftState(pool, 18, [])
+    if my_slot == 1:
+        row, pos = DraftSimulator(pool, p, state).best_pick(1)
+        state.append({"pick": 1, "team": 1, "player": pool.names[row], "assigned_pos": pos})
+    start = time.perf_counter()
+    leaves = likely_branches(pool, p, SimState.from_draft(state), total_picks(p))
+    assert time.perf_counter() - start < 5.0
+    assert len(leaves) == SPEC_MAX_BRANCHES
+    assert all(len(path) == opponent_picks for _, path, _ in leaves)
+    probs = [prob for prob, _, _ in leaves]
+    assert probs == sorted(probs, reverse=True)
+    # The top branch follows the heuristic's first choice at every pick.
+    greedy = SimState.from_draft(state)
+    DraftSimulator(pool, p, greedy).sim_to_slot(my_slot, total_picks(p))
+    assert leaves[0][2].taken.tolist() == greedy.taken.tolist()
+
+
+def test_cancelled_speculation_returns_nothing(pool, league):
+    cancelled = threading.Event()
+    cancelled.set()
+    root = SimState.empty(pool, league['num_teams'])
+    assert likely_branches(pool, league, root, total_picks(league), cancelled=cancelled) == []
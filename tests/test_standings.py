@@ -0,0 +1,55 @@
+import itertools
+
+import numpy as np
+
+from draft_engine import POSITIONS, DraftState, auto_draft
+from standings import Standings, best_lineup, hungarian
+
+
+def brute_best_lineup(values, elig, slots):
+    """Best total over every way of sending each player to an eligible slot or the bench."""
+    options = [[None] + [j for j in range(len(POSITIONS)) if elig[i, j]] for i in range(len(values))]
+    best = 0.0
+    for choice in itertools.product(*options):
+        used = np.bincount([j for j in choice if j is not None], minlength=len(POSITIONS))
+        if (used <= slots).all():
+            best = max(best, sum(v for v, j in zip(values, choice) if j is not None))
+    return best
+
+
+def test_hungarian_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        n = int(rng.integers(1, 6))
+        cost = rng.integers(-20, 20, (n, int(rng.integers(n, 7)))).astype(float)
+        cols = hungarian(cost)
+        assert len(set(cols.tolist())) == n
+        best = min(cost[np.arange(n), list(p)].sum() for p in itertools.permutations(range(cost.shape[1]), n))
+        assert cost[np.arange(n), cols].sum() == best
+
+
+def test_best_lineup_matches_brute_force():
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        k = int(rng.integers(0, 8))
+        values = rng.integers(0, 120, k).astype(float)
+        elig = rng.random((k, len(POSITIONS))) < 0.35
+        elig[np.arange(k), rng.integers(0, len(POSITIONS), k)] = True
+        slots = rng.integers(0, 3, len(POSITIONS))
+        total, lineup = best_lineup(values, elig, slots)
+        assert total == brute_best_lineup(values, elig, slots)
+        assert len({c for c, _ in lineup}) == len(lineup)
+        assert all(elig[c, j] for c, j in lineup)
+        assert (np.bincount([j for _, j in lineup], minlength=len(POSITIONS)) <= slots).all()
+
+
+def test_standings_agree_with_as_drafted_totals(pool, league):
+    table = Standings(pool, league).table(auto_draft(pool, league))
+    assert all(row['best'] >= row['fielded'] - 1e-9 for row in table)
+
+
+def test_duplicate_listing_scores_once(pool, league):
+    name = next(n for n, rows in pool.rows_by_name.items() if len(rows) > 1 and pool.avg[rows[0]] > 0 and pool.elig[rows[0], 0])
+    state = DraftState(pool, league['num_teams'], [{"pick": 1, "team": 1, "player": name, "assigned_pos": "DEF"}])
+    row = Standings(pool, league).table(state)[0]
+    assert row['fielded'] == row['best'] == row['whole'] == pool.avg[pool.row_for(name)]
@@ -0,0 +1,173 @@
+"""Headless tuning harness for the AI draft heuristic weights.
+
+Every weight set drafts once from each slot against a league of default
+(SIM_WEIGHTS) opponents, with noise on Power_Rating between repetitions, and is
+scored on the Final Teams "Combined Points (Fielded)" metric. Drafts run in
+lockstep through BatchDraft, chunked across a process pool.
+
+    python tune_weights.py --search random --trials 200 --reps 20 --out leaderboard.csv
+"""
+import argparse
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from draft_engine import POSITIONS, SIM_WEIGHTS, BatchDraft, PlayerPool, get_current_turn, total_picks
+from player_data import load_players
+
+GRID = {
+    "cost": [0.2, 0.4, 0.6, 0.8],
+    "need": [0.0, 5.0, 10.0, 20.0],
+    "over": [-10.0, -25.0, -50.0],
+    "breakout": [0.0, 20.0, 40.0],
+    "depth": [0, 2, 4],
+}
+# (low, high) for random search; depth is drawn as an integer.
+RANGES = {
+    "cost": (0.0, 1.0),
+    "need": (0.0, 30.0),
+    "over": (-60.0, 0.0),
+    "breakout": (0.0, 60.0),
+    "depth": (0, 6),
+}
+DEFAULT_LEAGUE = {"num_teams": 10, "DEF": 4, "MID": 5, "RUC": 1, "FWD": 4, "bench_size": 5}
+# Drafts stepped together per worker task.
+CHUNK_DRAFTS = 400
+
+_POOL = None
+
+
+def load_pool():
+    return PlayerPool(load_players())
+
+
+def grid_weights():
+    keys = list(GRID)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*GRID.values())]
+
+
+def random_weights(trials, seed=None):
+    rng = np.random.default_rng(seed)
+    sets = []
+    for _ in range(trials):
+        w = {k: round(float(rng.uniform(lo, hi)), 2) for k, (lo, hi) in RANGES.items() if k != "depth"}
+        w["depth"] = int(rng.integers(RANGES["depth"][0], RANGES["depth"][1] + 1))
+        sets.append(w)
+    return sets
+
+
+def fielded_totals(pool, p, rows, pos, teams, valid):
+    """Final Teams 'Fielded' metric for every team of every draft: (drafts, teams + 1)."""
+    avg = np.where(valid, np.append(pool.avg, 0.0)[rows], -np.inf)
+    totals = np.zeros((len(rows), p['num_teams'] + 1))
+    for t in range(1, p['num_teams'] + 1):
+        for j, label in enumerate(POSITIONS):
+            k = p.get(label, 0)
+            if not k: continue
+            vals = np.where((teams == t)[None, :] & (pos == j), avg, -np.inf)
+            top = -np.sort(-vals, axis=1)[:, :k]
+            totals[:, t] += np.where(np.isfinite(top), top, 0.0).sum(axis=1)
+    return totals
+
+
+def _init_worker(pool):
+    global _POOL
+    _POOL = pool
+
+
+def _run_chunk(job):
+    """Full drafts for a batch of (weight set, slot, seed) entries; returns (set index, slot, fielded, margin) rows."""
+    p, sets, entries, rating_sd = job
+    pool, num_teams = _POOL, p['num_teams']
+    drafts = len(entries)
+    ratings = np.empty((drafts, pool.size))
+    w = BatchDraft.uniform_weights(SIM_WEIGHTS, drafts, num_teams)
+    for d, (k, slot, seed) in enumerate(entries):
+        rng = np.random.default_rng(seed)
+        ratings[d] = pool.power + rng.normal(0.0, rating_sd, pool.size)
+        for key in ('need', 'over', 'breakout', 'depth'):
+            w[key][d, slot] = sets[k][key]
+        w['cost'][d, slot] = sets[k]['cost']
+    batch = BatchDraft(pool, p, ratings, w)
+    total = total_picks(p)
+    teams = np.array([get_current_turn(n, num_teams) for n in range(1, total + 1)])
+    rows = np.empty((drafts, total), dtype=int)
+    pos = np.empty((drafts, total), dtype=int)
+    valid = np.empty((drafts, total), dtype=bool)
+    for i, team in enumerate(teams):
+        rows[:, i], pos[:, i], valid[:, i] = batch.step(team)
+    totals = fielded_totals(pool, p, rows, pos, teams, valid)
+    slots = np.array([slot for _, slot, _ in entries])
+    mine = totals[np.arange(drafts), slots]
+    others = (totals[:, 1:].sum(axis=1) - mine) / max(num_teams - 1, 1)
+    return [(k, slot, f, m) for (k, slot, _), f, m in zip(entries, mine, mine - others)]
+
+
+def evaluate(pool, p, weight_sets, reps=1, rating_sd=5.0, workers=None, seed=None, progress=None):
+    """Leaderboard of weight sets by mean fielded margin over the rest of the league."""
+    sets = [dict(SIM_WEIGHTS)] + [w for w in weight_sets if w != SIM_WEIGHTS]
+    seeds = np.random.SeedSequence(seed).generate_state(reps)
+    # Every set sees the same noisy boards, so differences come from the weights alone.
+    entries = [(k, slot, int(s)) for k in range(len(sets)) for s in seeds for slot in range(1, p['num_teams'] + 1)]
+    workers = workers or os.cpu_count() or 1
+    size = max(1, min(CHUNK_DRAFTS, -(-len(entries) // workers)))
+    jobs = [(p, sets, entries[i:i + size], rating_sd) for i in range(0, len(entries), size)]
+    results, done = [], 0
+    if workers > 1:
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(pool,)) as ex:
+            for chunk in ex.map(_run_chunk, jobs):
+                results += chunk; done += len(chunk)
+                if progress: progress(done, len(entries))
+    else:
+        _init_worker(pool)
+        for job in jobs:
+            chunk = _run_chunk(job)
+            results += chunk; done += len(chunk)
+            if progress: progress(done, len(entries))
+    res = pd.DataFrame(results, columns=["set", "slot", "fielded", "margin"])
+    by_slot = res.groupby(["set", "slot"])["margin"].mean().groupby("set")
+    board = pd.DataFrame(sets)
+    board["mean_fielded"] = res.groupby("set")["fielded"].mean().round(1)
+    board["mean_margin"] = res.groupby("set")["margin"].mean().round(1)
+    board["worst_slot_margin"] = by_slot.min().round(1)
+    board["drafts"] = res.groupby("set").size()
+    board["baseline"] = board.index == 0
+    return board.sort_values("mean_margin", ascending=False).reset_index(drop=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--search", choices=["grid", "random"], default="random")
+    ap.add_argument("--trials", type=int, default=50, help="weight sets to sample for random search")
+    ap.add_argument("--reps", type=int, default=5, help="noisy boards per weight set and slot")
+    ap.add_argument("--rating-sd", type=float, default=5.0)
+    ap.add_argument("--teams", type=int, default=DEFAULT_LEAGUE["num_teams"])
+    ap.add_argument("--bench", type=int, default=DEFAULT_LEAGUE["bench_size"])
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--out", default="leaderboard.csv")
+    args = ap.parse_args(argv)
+
+    p = dict(DEFAULT_LEAGUE, num_teams=args.teams, bench_size=args.bench)
+    sets = grid_weights() if args.search == "grid" else random_weights(args.trials, args.seed)
+    pool = load_pool()
+    start = time.perf_counter()
+
+    def progress(done, total):
+        print(f"\r{done}/{total} drafts ({done / (time.perf_counter() - start):.0f}/s)", end="", flush=True)
+
+    board = evaluate(pool, p, sets, args.reps, args.rating_sd, args.workers, args.seed, progress)
+    print()
+    board.to_csv(args.out, index=False)
+    print(board.head(10).to_string(index=False))
+    print(f"Leaderboard of {len(board)} weight sets written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()